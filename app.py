@@ -1,7 +1,30 @@
+import importlib
+
 import streamlit as st
-import altair as alt
-import pandas as pd
-import numpy as np
+
+from application_pages.warmup import start_background_warm_up
+from risk_engine.instrumentation import record_run, stage, startup
+
+# Navigation title -> (module, entry point); a page's module and its heavy dependencies are imported on first visit
+PAGES = {
+    "Data Generation & Visualization": ("application_pages.page1", "run_page1"),
+    "Risk Profile & Monitoring": ("application_pages.page2", "run_page2"),
+    "Portfolio Monitoring": ("application_pages.page4", "run_page4"),
+}
+
+
+def run_page(title):
+    module_name, function_name = PAGES[title]
+    with stage(f"import {module_name}"):
+        module = importlib.import_module(module_name)
+    getattr(module, function_name)()
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_once():
+    """Starts the background warm-up once per server process."""
+    return start_background_warm_up()
+
 
 st.set_page_config(page_title="QuLab: Risk Appetite Framework Explorer", layout="wide")
 st.sidebar.image("https://www.quantuniversity.com/assets/img/logo5.jpg")
@@ -9,36 +32,38 @@ st.sidebar.divider()
 st.title("QuLab: Risk Appetite Framework Explorers")
 st.divider()
 
-page = st.sidebar.selectbox(label="Navigation", options=["Data Generation & Visualization", "Risk Profile & Monitoring"], key="main_nav")
-if page == "Data Generation & Visualization":
-    st.markdown(r"""
-    In this lab, we will explore the Risk Appetite Framework. This framework is a key component of operational risk management, allowing organizations to define their risk tolerance and monitor their risk profile against these defined thresholds.
-
-    We will simulate various business operations, revenues, and loss events to generate synthetic data. Users can adjust parameters such as growth rate, loss frequency, and loss severity to observe their impact on key risk metrics.
-
-    **Key Concepts:**
-
-    *   **Risk Capacity:** The maximum amount of risk an organization can take, often determined by its financial resources or regulatory requirements.
-    *   **Risk Appetite:** The level of risk an organization is willing to accept in pursuit of its objectives.
-    *   **Expected Loss ($EL$):** The average loss an organization expects to incur over a given period.
-        $$EL = \frac{1}{n} \sum_{i=1}^{n} L_i$$
-    *   **Unexpected Loss ($UL$):** The potential for losses to exceed the expected loss, often quantified using the standard deviation.
-        $$UL = \sqrt{\frac{1}{n-1} \sum_{i=1}^{n} (L_i - EL)^2}$$
-    *   **Key Risk Indicators (KRIs):** Metrics used to monitor and track key risks within the organization.
-
-    This application will provide a dynamic environment to:
-
-    1.  **Simulate Data:** Generate synthetic time-series data for business operations, financial performance, and simulated operational loss events.
-    2.  **Define Risk Appetite:** Enable users to set quantitative risk appetite statements (e.g., maximum acceptable Expected Loss, Unexpected Loss, tolerance for severe loss events, KRI limits).
-    3.  **Visualize Risk Profile & Capacity:** Display the simulated 'Risk Capacity' and evolving 'Risk Profile' over time, comparing them against defined risk appetite thresholds.
-    4.  **Monitor Breaches:** Track and visualize instances where the simulated risk profile exceeds the defined risk appetite.
-    5.  **KRI Dashboard:** Present a dashboard of simulated Key Risk Indicators (KRIs) and their status relative to pre-set thresholds.
-    """)
-    from application_pages.page1 import run_page1
-    run_page1()
-elif page == "Risk Profile & Monitoring":
-    from application_pages.page2 import run_page2
-    run_page2()
+page = st.sidebar.selectbox(label="Navigation", options=list(PAGES), key="main_nav")
+# Time every stage of this rerun for the Stage Timings panel
+with record_run(page) as run:
+    run_page(page)
+startup.setdefault('first_run_seconds', run.seconds)
+# Started after the first page has rendered so it does not delay it
+warm_up_thread = warm_up_once()
+
+# Compute cache statistics (shared by all sessions in this process); the page has already imported the cache
+from risk_engine.cache import get_compute_cache
+cache_stats = get_compute_cache().stats()
+with st.sidebar.expander("Compute Cache"):
+    st.caption(
+        f"{cache_stats['hits']} hits · {cache_stats['misses']} misses · {cache_stats['evictions']} evictions  \n"
+        f"{cache_stats['entries']} entries · {cache_stats['bytes'] / 1024 ** 2:.1f} MB"
+    )
+
+# Stage timings of the run that just rendered
+with st.sidebar.expander("Stage Timings"):
+    st.caption(f"Last run: {run.seconds:.3f}s total · first run in this process: {startup['first_run_seconds']:.3f}s")
+    if 'warmup_seconds' in startup:
+        st.caption(f"Warm-up: {startup['warmup_seconds']:.2f}s")
+    elif 'warmup_error' in startup:
+        st.caption(f"Warm-up failed: {startup['warmup_error']}")
+    elif warm_up_thread is not None:
+        st.caption("Warm-up running in the background...")
+    if run.stages:
+        st.dataframe(run.to_frame(), hide_index=True)
+    if run.profile_path:
+        st.caption(f"Profile written to `{run.profile_path}`")
+    elif run.profile_note:
+        st.caption(run.profile_note)
 
 
 # License
@@ -5,7 +5,93 @@ import numpy as np
 import altair as alt
 from datetime import datetime
 
+from risk_engine.cache import memoize
+from risk_engine.chart_data import bin_losses, downsample, fold_metrics
+from risk_engine.distributions import FREQUENCY_MODELS, SEVERITY_MODELS
+from risk_engine.instrumentation import stage, timed
+from risk_engine.simulation import simulate_operations
+from risk_engine.store import get_default_store, scenario_key
+
+
+# Landing overview of the lab, shown above the first page
+LAB_OVERVIEW = r"""
+    In this lab, we will explore the Risk Appetite Framework. This framework is a key component of operational risk management, allowing organizations to define their risk tolerance and monitor their risk profile against these defined thresholds.
+
+    We will simulate various business operations, revenues, and loss events to generate synthetic data. Users can adjust parameters such as growth rate, loss frequency, and loss severity to observe their impact on key risk metrics.
+
+    **Key Concepts:**
+
+    *   **Risk Capacity:** The maximum amount of risk an organization can take, often determined by its financial resources or regulatory requirements.
+    *   **Risk Appetite:** The level of risk an organization is willing to accept in pursuit of its objectives.
+    *   **Expected Loss ($EL$):** The average loss an organization expects to incur over a given period.
+        $$EL = \frac{1}{n} \sum_{i=1}^{n} L_i$$
+    *   **Unexpected Loss ($UL$):** The potential for losses to exceed the expected loss, often quantified using the standard deviation.
+        $$UL = \sqrt{\frac{1}{n-1} \sum_{i=1}^{n} (L_i - EL)^2}$$
+    *   **Key Risk Indicators (KRIs):** Metrics used to monitor and track key risks within the organization.
+
+    This application will provide a dynamic environment to:
+
+    1.  **Simulate Data:** Generate synthetic time-series data for business operations, financial performance, and simulated operational loss events.
+    2.  **Define Risk Appetite:** Enable users to set quantitative risk appetite statements (e.g., maximum acceptable Expected Loss, Unexpected Loss, tolerance for severe loss events, KRI limits).
+    3.  **Visualize Risk Profile & Capacity:** Display the simulated 'Risk Capacity' and evolving 'Risk Profile' over time, comparing them against defined risk appetite thresholds.
+    4.  **Monitor Breaches:** Track and visualize instances where the simulated risk profile exceeds the defined risk appetite.
+    5.  **KRI Dashboard:** Present a dashboard of simulated Key Risk Indicators (KRIs) and their status relative to pre-set thresholds.
+"""
+
+# Sidebar defaults; the warm-up hook precomputes this scenario before the first visit
+DEFAULT_PARAMS = {
+    'start_date': datetime(2022, 1, 1),
+    'end_date': datetime(2022, 1, 31),
+    'growth_rate': 0.02,
+    'loss_freq_model': 'Poisson',
+    'loss_freq_mean': 2.0,
+    'loss_freq_std': 1.0,
+    'loss_sev_model': 'Normal',
+    'loss_sev_mean': 1200.0,
+    'loss_sev_std': 300.0,
+    'kri_baseline': 50.0,
+    'kri_volatility': 5.0,
+    'seed': 42,
+}
+
+
+def build_scenario_params(params):
+    """Turns sidebar values (keyed as in ``DEFAULT_PARAMS``) into the ``generate_synthetic_data`` arguments."""
+    return (
+        params['start_date'], params['end_date'],
+        {'growth_rate': params['growth_rate']},
+        {'model': params['loss_freq_model'], 'mean': params['loss_freq_mean'], 'std': params['loss_freq_std']},
+        {'model': params['loss_sev_model'], 'mean': params['loss_sev_mean'], 'std': params['loss_sev_std']},
+        {'baseline': params['kri_baseline'], 'volatility': params['kri_volatility']},
+        int(params['seed'])
+    )
+
+
+def generate_synthetic_data(start_date, end_date, business_params, loss_freq_params, loss_sev_params, kpi_params, seed=None):
+    """Generates synthetic time-series data for the Streamlit app."""
+    # Not memoized: results are persisted in the scenario store, which is shared across sessions
+    with stage('generate_synthetic_data') as record:
+        df_simulated_operations, loss_events = simulate_operations(
+            start_date, end_date, business_params, loss_freq_params, loss_sev_params, kpi_params,
+            rng=np.random.default_rng(seed)
+        )
+        record.rows = len(df_simulated_operations) + len(loss_events)
+    return df_simulated_operations, loss_events
+
+
+@timed(rows=lambda df_simulated_operations, loss_events: len(df_simulated_operations) + len(loss_events))
+@memoize()
+def prepare_chart_data(df_simulated_operations, loss_events):
+    """Downsamples, folds and bins the simulated data so chart payloads stay small for long horizons."""
+    df_ops_sampled = downsample(df_simulated_operations, 'Date', ['BusinessVolume', 'Revenue'])
+    df_ops_long = fold_metrics(df_ops_sampled, 'Date', ['BusinessVolume', 'Revenue'])
+    df_kri_sampled = downsample(df_simulated_operations[['Date', 'KRI']], 'Date', ['KRI'])
+    df_loss_bins = bin_losses(loss_events.amounts)
+    return df_ops_long, df_kri_sampled, df_loss_bins
+
+
 def run_page1():
+    st.markdown(LAB_OVERVIEW)
     st.header("Data Generation and Visualization")
     st.markdown("""
     **Page Overview:**
@@ -24,87 +110,74 @@ def run_page1():
         st.subheader("1. Data Generation Parameters")
         col_start, col_end = st.columns(2)
         with col_start:
-            sim_start_date = st.date_input("Simulation Start Date", value=datetime(2022, 1, 1), help="Start date for synthetic data generation.")
+            sim_start_date = st.date_input("Simulation Start Date", value=DEFAULT_PARAMS['start_date'], help="Start date for synthetic data generation.")
         with col_end:
-            sim_end_date = st.date_input("Simulation End Date", value=datetime(2022, 1, 31), help="End date for synthetic data generation.")
+            sim_end_date = st.date_input("Simulation End Date", value=DEFAULT_PARAMS['end_date'], help="End date for synthetic data generation.")
 
         st.markdown("**Business Parameters**")
-        growth_rate = st.slider("Growth Rate", min_value=0.0, max_value=0.1, value=0.02, step=0.005, format="%.3f", help="Annual growth rate for business volume.")
+        growth_rate = st.slider("Growth Rate", min_value=0.0, max_value=0.1, value=DEFAULT_PARAMS['growth_rate'], step=0.005, format="%.3f", help="Annual growth rate for business volume.")
 
-        st.markdown("**Loss Frequency Parameters (Poisson)**")
-        loss_freq_mean = st.slider("Loss Frequency Mean", min_value=0.5, max_value=10.0, value=2.0, step=0.1, format="%.1f", help="Average number of loss events per period.")
-        loss_freq_std = st.slider("Loss Frequency Std Dev", min_value=0.1, max_value=5.0, value=1.0, step=0.1, format="%.1f", help="Standard deviation for loss event frequency.")
+        st.markdown("**Loss Frequency Parameters**")
+        loss_freq_model = st.selectbox("Frequency Model", options=list(FREQUENCY_MODELS), index=list(FREQUENCY_MODELS).index(DEFAULT_PARAMS['loss_freq_model']), help="Distribution of the number of loss events per day. Negative Binomial needs Std Dev^2 > Mean, Binomial needs Std Dev^2 < Mean; Poisson ignores the Std Dev.")
+        loss_freq_mean = st.slider("Loss Frequency Mean", min_value=0.5, max_value=10.0, value=DEFAULT_PARAMS['loss_freq_mean'], step=0.1, format="%.1f", help="Average number of loss events per period.")
+        loss_freq_std = st.slider("Loss Frequency Std Dev", min_value=0.1, max_value=5.0, value=DEFAULT_PARAMS['loss_freq_std'], step=0.1, format="%.1f", help="Standard deviation for loss event frequency.")
 
 
-        st.markdown("**Loss Severity Parameters (Normal)**")
-        loss_sev_mean = st.slider("Loss Severity Mean", min_value=100.0, max_value=5000.0, value=1200.0, step=50.0, help="Average amount of each loss event.")
-        loss_sev_std = st.slider("Loss Severity Std Dev", min_value=10.0, max_value=1000.0, value=300.0, step=10.0, help="Standard deviation of loss event amounts.")
+        st.markdown("**Loss Severity Parameters**")
+        loss_sev_model = st.selectbox("Severity Model", options=list(SEVERITY_MODELS), index=list(SEVERITY_MODELS).index(DEFAULT_PARAMS['loss_sev_model']), help="Distribution of individual loss amounts, matched to the mean and standard deviation below (only approximately for the spliced model, whose heavier tail raises both).")
+        loss_sev_mean = st.slider("Loss Severity Mean", min_value=100.0, max_value=5000.0, value=DEFAULT_PARAMS['loss_sev_mean'], step=50.0, help="Average amount of each loss event.")
+        loss_sev_std = st.slider("Loss Severity Std Dev", min_value=10.0, max_value=1000.0, value=DEFAULT_PARAMS['loss_sev_std'], step=10.0, help="Standard deviation of loss event amounts.")
 
         st.markdown("**KRI Parameters**")
-        kri_baseline = st.slider("KRI Baseline", min_value=10.0, max_value=100.0, value=50.0, step=1.0, help="Average level of the Key Risk Indicator.")
-        kri_volatility = st.slider("KRI Volatility", min_value=1.0, max_value=20.0, value=5.0, step=0.5, help="Variability of the Key Risk Indicator.")
-
-        @st.cache_data(show_spinner=False)
-        def generate_synthetic_data(start_date, end_date, business_params, loss_freq_params, loss_sev_params, kpi_params):
-            """Generates synthetic time-series data for the Streamlit app."""
-            if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
-                raise TypeError("start_date and end_date must be datetime objects.")
-            if start_date > end_date:
-                raise ValueError("start_date must be before end_date.")
-
-            dates = pd.date_range(start_date, end_date)
-            df_simulated_operations = pd.DataFrame({'Date': dates})
-
-            # Business Volume
-            growth_rate = business_params.get('growth_rate', 0.01)
-            df_simulated_operations['BusinessVolume'] = 100.0
-            for i in range(1, len(df_simulated_operations)):
-                df_simulated_operations.loc[i, 'BusinessVolume'] = df_simulated_operations.loc[i-1, 'BusinessVolume'] * (1 + growth_rate)
-            df_simulated_operations['BusinessVolume'] = df_simulated_operations['BusinessVolume'].astype(int)
-
-            # Revenue
-            df_simulated_operations['Revenue'] = df_simulated_operations['BusinessVolume'] * 0.1
-
-            # Loss Events
-            loss_mean = loss_freq_params.get('mean', 2)
-            loss_std = loss_freq_params.get('std', 1)
-            loss_dfs = []
-            for date in dates:
-                num_losses = np.random.poisson(loss_mean) # Poisson for counts
-                if num_losses > 0:
-                    loss_amounts = np.random.normal(loss_sev_params.get('mean', 1000), loss_sev_params.get('std', 200), num_losses)
-                    temp_df = pd.DataFrame({'Date': [date] * num_losses, 'LossAmount': loss_amounts})
-                    loss_dfs.append(temp_df)
-
-            if loss_dfs:
-                df_loss_events = pd.concat(loss_dfs, ignore_index=True)
-                df_loss_events['LossAmount'] = df_loss_events['LossAmount'].abs() # Ensure positive loss amounts
-            else:
-                df_loss_events = pd.DataFrame(columns=['Date', 'LossAmount']) # Create an empty DataFrame if no losses
-
-            # Key Risk Indicator
-            baseline = kpi_params.get('baseline', 50)
-            volatility = kpi_params.get('volatility', 5)
-            df_simulated_operations['KRI'] = np.random.normal(baseline, volatility, len(df_simulated_operations))
-
-            return df_simulated_operations, df_loss_events
+        kri_baseline = st.slider("KRI Baseline", min_value=10.0, max_value=100.0, value=DEFAULT_PARAMS['kri_baseline'], step=1.0, help="Average level of the Key Risk Indicator.")
+        kri_volatility = st.slider("KRI Volatility", min_value=1.0, max_value=20.0, value=DEFAULT_PARAMS['kri_volatility'], step=0.5, help="Variability of the Key Risk Indicator.")
+
+        st.markdown("**Reproducibility**")
+        random_seed = st.number_input("Random Seed", min_value=0, max_value=2**32 - 1, value=DEFAULT_PARAMS['seed'], step=1, help="Seed for the random number generator; the same seed reproduces the same scenario.")
 
         # Convert sim_start_date and sim_end_date to datetime if needed
         if not isinstance(sim_start_date, datetime):
             sim_start_date = datetime.combine(sim_start_date, datetime.min.time())
         if not isinstance(sim_end_date, datetime):
             sim_end_date = datetime.combine(sim_end_date, datetime.min.time())
-        # Trigger data generation
-        df_ops, df_losses = generate_synthetic_data(
-            sim_start_date, sim_end_date,
-            {'growth_rate': growth_rate},
-            {'mean': loss_freq_mean, 'std': loss_freq_std},
-            {'mean': loss_sev_mean, 'std': loss_sev_std},
-            {'baseline': kri_baseline, 'volatility': kri_volatility}
-        )
-        # Store generated data in session_state for use in other pages
-        st.session_state['df_ops'] = df_ops
-        st.session_state['df_losses'] = df_losses
+        if sim_start_date > sim_end_date:
+            st.error("The simulation start date must be on or before the end date.")
+            st.stop()
+        scenario_params = build_scenario_params({
+            'start_date': sim_start_date,
+            'end_date': sim_end_date,
+            'growth_rate': growth_rate,
+            'loss_freq_model': loss_freq_model,
+            'loss_freq_mean': loss_freq_mean,
+            'loss_freq_std': loss_freq_std,
+            'loss_sev_model': loss_sev_model,
+            'loss_sev_mean': loss_sev_mean,
+            'loss_sev_std': loss_sev_std,
+            'kri_baseline': kri_baseline,
+            'kri_volatility': kri_volatility,
+            'seed': random_seed,
+        })
+        loss_freq_params, loss_sev_params = scenario_params[3], scenario_params[4]
+        # Trigger data generation, unless this scenario is already in the on-disk store
+        with stage('load scenario'):
+            scenario_store = get_default_store()
+            try:
+                scenario = scenario_store.get_or_create(
+                    scenario_key(*scenario_params),
+                    lambda: generate_synthetic_data(*scenario_params),
+                    scenario_params
+                )
+            except ValueError as e:
+                st.error(f"Invalid simulation parameters: {e}")
+                st.stop()
+            df_ops, loss_events = scenario_store.load(scenario)
+        # Store only a handle to the generated data in session_state for use in other pages
+        st.session_state['scenario'] = scenario
+        st.session_state['sim_params'] = {
+            'loss_freq_params': loss_freq_params,
+            'loss_sev_params': loss_sev_params,
+            'seed': int(random_seed)
+        }
 
     st.subheader("Simulated Business Operations Data")
     st.write("This table shows the generated time-series data for business volume, revenue, and KRI.")
@@ -112,51 +185,52 @@ def run_page1():
 
     st.subheader("Simulated Loss Events Data")
     st.write("This table displays the individual simulated operational loss events.")
-    st.dataframe(df_losses.head())
+    st.dataframe(loss_events.head())
 
     # Ensure df_ops 'Date' column is datetime for Altair
     df_ops['Date'] = pd.to_datetime(df_ops['Date'])
 
-    st.subheader("Business Volume and Revenue Trend")
-    st.markdown("""
-    This chart shows how your business volume and revenue evolve over the selected time period. The growth rate and other business parameters in the sidebar directly affect these trends, helping you visualize the impact of different scenarios on your organization's performance.
-    """)
-    chart_ops = alt.Chart(df_ops).transform_fold(
-        ['BusinessVolume', 'Revenue'],
-        as_=['Metric', 'Value']
-    ).mark_line().encode(
-        x=alt.X('Date:T', title='Date'),
-        y=alt.Y('Value:Q', title='Amount'),
-        color=alt.Color('Metric:N', title='Metric', scale=alt.Scale(range=['#1f77b4', '#ff7f0e'])) # Color-blind friendly
-    ).properties(
-        title='Simulated Business Volume and Revenue Over Time'
-    ).interactive()
-    st.altair_chart(chart_ops, use_container_width=True)
-
-    st.subheader("Key Risk Indicator (KRI) Trend")
-    st.markdown("""
-    The KRI chart tracks the simulated risk indicator for each time point. By adjusting the KRI baseline and volatility sliders, you can see how risk levels fluctuate and identify periods of increased risk exposure.
-    """)
-    chart_kri = alt.Chart(df_ops).mark_line(color='#2ca02c').encode(
-        x=alt.X('Date:T', title='Date'),
-        y=alt.Y('KRI:Q', title='KRI Value')
-    ).properties(
-        title='Key Risk Indicator (KRI) Over Time'
-    )
-    st.altair_chart(chart_kri, use_container_width=True)
-
-    st.subheader("Operational Loss Event Distribution")
-    st.markdown("""
-    This histogram displays the distribution of operational loss amounts generated in the simulation. The frequency and severity sliders in the sidebar control the shape and spread of the losses, allowing you to explore how different risk scenarios affect loss outcomes.
-    """)
-    if not df_losses.empty:
-        chart_loss_hist = alt.Chart(df_losses).mark_bar(color='#9467bd').encode(
-            x=alt.X('LossAmount:Q', bin=alt.Bin(maxbins=30), title='Loss Amount ($)'),
-            y=alt.Y('count()', title='Number of Losses'),
-            tooltip=['count()']
+    df_ops_long, df_kri_sampled, df_loss_bins = prepare_chart_data(df_ops, loss_events)
+
+    with stage('render charts'):
+        st.subheader("Business Volume and Revenue Trend")
+        st.markdown("""
+        This chart shows how your business volume and revenue evolve over the selected time period. The growth rate and other business parameters in the sidebar directly affect these trends, helping you visualize the impact of different scenarios on your organization's performance.
+        """)
+        chart_ops = alt.Chart(df_ops_long).mark_line().encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('Value:Q', title='Amount'),
+            color=alt.Color('Metric:N', title='Metric', scale=alt.Scale(range=['#1f77b4', '#ff7f0e'])) # Color-blind friendly
+        ).properties(
+            title='Simulated Business Volume and Revenue Over Time'
+        ).interactive()
+        st.altair_chart(chart_ops, use_container_width=True)
+
+        st.subheader("Key Risk Indicator (KRI) Trend")
+        st.markdown("""
+        The KRI chart tracks the simulated risk indicator for each time point. By adjusting the KRI baseline and volatility sliders, you can see how risk levels fluctuate and identify periods of increased risk exposure.
+        """)
+        chart_kri = alt.Chart(df_kri_sampled).mark_line(color='#2ca02c').encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('KRI:Q', title='KRI Value')
         ).properties(
-            title='Distribution of Simulated Loss Amounts'
+            title='Key Risk Indicator (KRI) Over Time'
         )
-        st.altair_chart(chart_loss_hist, use_container_width=True)
-    else:
-        st.info("No loss events simulated based on current parameters.")
+        st.altair_chart(chart_kri, use_container_width=True)
+
+        st.subheader("Operational Loss Event Distribution")
+        st.markdown("""
+        This histogram displays the distribution of operational loss amounts generated in the simulation. The frequency and severity sliders in the sidebar control the shape and spread of the losses, allowing you to explore how different risk scenarios affect loss outcomes.
+        """)
+        if not loss_events.empty:
+            chart_loss_hist = alt.Chart(df_loss_bins).mark_bar(color='#9467bd').encode(
+                x=alt.X('BinStart:Q', title='Loss Amount ($)'),
+                x2='BinEnd:Q',
+                y=alt.Y('Count:Q', title='Number of Losses'),
+                tooltip=[alt.Tooltip('BinStart:Q', title='From'), alt.Tooltip('BinEnd:Q', title='To'), alt.Tooltip('Count:Q', title='Number of Losses')]
+            ).properties(
+                title='Distribution of Simulated Loss Amounts'
+            )
+            st.altair_chart(chart_loss_hist, use_container_width=True)
+        else:
+            st.info("No loss events simulated based on current parameters.")
@@ -1,8 +1,187 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 
+from risk_engine.cache import memoize
+from risk_engine.capacity import cumulative_daily_losses, exhaustion_day, paths_within_budget, simulate_capacity_paths
+from risk_engine.chart_data import downsample, fold_metrics
+from risk_engine.instrumentation import stage, timed
+from risk_engine.montecarlo import MAX_INTERACTIVE_DRAWS, risk_measures, simulate_aggregate_losses
+from risk_engine.pipeline import build_risk_profile, evaluate_risk_appetite
+from risk_engine.severe import SevereLossIndex
+from risk_engine.store import get_default_store
+from risk_engine.streaming import LiveFeed
+
+LIVE_REFRESH_SECONDS = 2
+LIVE_TAIL_DAYS = 365
+
+# Sidebar defaults; the warm-up hook precomputes these results before the first visit
+DEFAULT_SETTINGS = {
+    'max_expected_loss': 1300,
+    'max_unexpected_loss': 380,
+    'max_severe_loss_events': 5,
+    'severe_loss_threshold': 2000,
+    'kri_limit': 55.0,
+    'risk_capacity': 50000,
+    'window_days': 30,
+    'use_ewma': False,
+    'ewma_halflife': 15,
+    'mc_scenarios': 100_000,
+    'mc_period_days': 1,
+    'mc_confidence_levels': [0.95, 0.99],
+    'capacity_paths': 1000,
+}
+
+
+def build_risk_appetite_params(max_expected_loss, max_unexpected_loss, max_severe_loss_events,
+                               severe_loss_threshold, kri_limit, risk_capacity):
+    """Consolidates the sidebar thresholds into the risk appetite dictionary used downstream."""
+    return {
+        'MaxExpectedLoss_Threshold': float(max_expected_loss),
+        'MaxUnexpectedLoss_Threshold': float(max_unexpected_loss),
+        'MaxSevereLossEvents_Threshold': int(max_severe_loss_events),
+        'SevereLoss_Threshold': float(severe_loss_threshold),
+        'KRI_Limit': float(kri_limit),
+        'RiskCapacity': float(risk_capacity)
+    }
+
+
+@timed(rows=lambda df_simulated_operations, loss_events, *args, **kwargs: len(df_simulated_operations) + len(loss_events))
+@memoize()
+def calculate_risk_profile(df_simulated_operations, loss_events, user_parameters, window_days=30, ewma_halflife=None):
+    """Computes the organization's simulated risk profile over time."""
+    if df_simulated_operations.empty and loss_events.empty:
+        return pd.DataFrame()
+
+    # Loss events are stored as day offsets, so only the operations dates need converting
+    try:
+        df_simulated_operations['Date'] = pd.to_datetime(df_simulated_operations['Date'])
+    except Exception as e:
+        st.error(f"Error converting dates: {e}")
+        raise e
+
+    return build_risk_profile(
+        df_simulated_operations, loss_events, user_parameters,
+        window_days=window_days, ewma_halflife=ewma_halflife,
+        severe_loss_index=build_severe_loss_index(loss_events)
+    )
+
+
+@timed(rows=lambda loss_events: len(loss_events))
+@memoize()
+def build_severe_loss_index(loss_events):
+    """Sorts the loss events once per scenario so severe-loss counts for any threshold are binary searches."""
+    return SevereLossIndex.from_loss_events(loss_events)
+
+
+@timed(rows=lambda df_risk_profile, risk_appetite_params: len(df_risk_profile))
+@memoize()
+def monitor_risk_appetite(df_risk_profile, risk_appetite_params):
+    """Compares risk profile against risk appetite, identifies breaches and evaluates KRI status."""
+    if not isinstance(df_risk_profile, pd.DataFrame):
+        raise TypeError("df_risk_profile must be a Pandas DataFrame.")
+    if not isinstance(risk_appetite_params, dict):
+        raise TypeError("risk_appetite_params must be a dictionary.")
+
+    df_breaches = pd.DataFrame()
+    df_kri_status = pd.DataFrame()
+
+    if df_risk_profile.empty:
+        return df_breaches, df_kri_status
+
+    # Ensure 'Date' column is present for merging later
+    if 'Date' not in df_risk_profile.columns:
+        st.warning("Date column not found in df_risk_profile. Breach monitoring might be inaccurate.")
+        return pd.DataFrame(), pd.DataFrame() # Return empty if essential column is missing
+
+    return evaluate_risk_appetite(df_risk_profile, risk_appetite_params)
+
+
+@timed(rows=lambda n_scenarios, *args: n_scenarios)
+@memoize()
+def calculate_monte_carlo_risk(n_scenarios, loss_freq_params, loss_sev_params, period_days, confidence_levels, seed):
+    """Simulates aggregate losses and summarises them as EL, VaR and Expected Shortfall.
+
+    Runs too large to finish within a rerun raise ValueError.
+    """
+    # Large runs are split across all cores; small ones are cheaper in-process
+    n_workers = 1 if n_scenarios < 1_000_000 else None
+    aggregate_losses = simulate_aggregate_losses(
+        n_scenarios, loss_freq_params, loss_sev_params,
+        period_days=period_days, seed=seed, n_workers=n_workers, max_total_draws=MAX_INTERACTIVE_DRAWS
+    )
+    return risk_measures(aggregate_losses, confidence_levels)
+
+
+@timed(rows=lambda loss_events: len(loss_events))
+@memoize()
+def calculate_cumulative_losses(loss_events):
+    """Running total of the scenario's daily losses, computed once per scenario."""
+    return cumulative_daily_losses(loss_events)
+
+
+@timed(rows=lambda n_paths, n_days, *args: n_paths * n_days)
+@memoize()
+def calculate_capacity_paths(n_paths, n_days, loss_freq_params, loss_sev_params, seed):
+    """Simulates and indexes cumulative loss paths once, so moving the capacity slider only runs binary searches.
+
+    Long horizons get fewer paths, so the index stays within ``MAX_CAPACITY_PATH_CELLS`` path-days.
+    """
+    return simulate_capacity_paths(paths_within_budget(n_paths, n_days), n_days, loss_freq_params, loss_sev_params, seed=seed)
+
+
+def merge_live_delta(df_tail, df_delta):
+    """Overwrites the rows of ``df_tail`` that ``df_delta`` recomputed and keeps the last ``LIVE_TAIL_DAYS`` days."""
+    if df_tail is None:
+        return df_delta.tail(LIVE_TAIL_DAYS).reset_index(drop=True)
+    df_tail = df_tail[df_tail['Date'] < df_delta['Date'].iloc[0]]
+    return pd.concat([df_tail, df_delta], ignore_index=True).tail(LIVE_TAIL_DAYS).reset_index(drop=True)
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_feed_panel():
+    """Drains the live feed and redraws only this section of the page."""
+    feed = st.session_state['live_feed']
+    live_tail = st.session_state.setdefault('live_tail', {'profile': None, 'breaches': None, 'kri_status': None})
+    for delta in feed.drain():
+        if delta is None or delta.profile.empty:
+            continue
+        for name in live_tail:
+            live_tail[name] = merge_live_delta(live_tail[name], getattr(delta, name))
+
+    if feed.error is not None:
+        st.error(f"Live feed stopped: {feed.error}")
+    monitor = feed.monitor
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Days Monitored", len(monitor.profile))
+    col2.metric("Loss Events", len(monitor.loss_amounts))
+    col3.metric("Records Dropped", monitor.dropped, help="Records dated before the first day of the feed.")
+    col4.metric("Records Rejected", monitor.rejected, help="Malformed lines, unknown record types, bad dates and non-finite values; they are skipped.")
+
+    df_live_profile = live_tail['profile']
+    if df_live_profile is None:
+        st.info(f"Waiting for records from {feed.source}...")
+        return
+
+    st.markdown("**Latest Breach Status:**")
+    st.dataframe(live_tail['breaches'].tail(10).merge(live_tail['kri_status'], on='Date', how='left'))
+
+    df_live_melted = fold_metrics(
+        downsample(df_live_profile, 'Date', ['ExpectedLoss', 'UnexpectedLoss']),
+        'Date', ['ExpectedLoss', 'UnexpectedLoss'], var_name='RiskMetric'
+    )
+    live_chart = alt.Chart(df_live_melted).mark_line().encode(
+        x=alt.X('Date:T', title='Date'),
+        y=alt.Y('Value:Q', title='Loss Amount ($)'),
+        color=alt.Color('RiskMetric:N', title='Risk Metric', scale=alt.Scale(range=['#17becf', '#e377c2']))
+    ).properties(
+        title=f'Live Expected and Unexpected Loss (last {LIVE_TAIL_DAYS} days)'
+    )
+    st.altair_chart(live_chart, use_container_width=True)
+
+
 def run_page2():
     st.header("Risk Profile and Monitoring")
     st.markdown("""
@@ -12,130 +191,69 @@ def run_page2():
     - The risk profile table summarizes risk metrics for each time period.
     - The breach monitoring table highlights when risk metrics exceed your defined appetite.
     - The KRI performance chart shows KRI values and whether they are within or above the set limit.
+    - The Monte Carlo section estimates Value-at-Risk (VaR) and Expected Shortfall (ES) of aggregate losses.
+    - The Risk Capacity section tracks cumulative losses against the capacity buffer and the probability of exhausting it.
     - References for further reading are provided at the bottom.
     """)
 
     # Streamlit UI for risk appetite parameters (in sidebar)
     with st.sidebar:
         st.subheader("2. Define Risk Appetite")
-        max_expected_loss_input = st.slider("Max Expected Loss ($EL$)", min_value=0, max_value=5000, value=1300, step=10, help="Maximum average loss an organization expects to incur.")
-        max_unexpected_loss_input = st.slider("Max Unexpected Loss ($UL$)", min_value=0, max_value=1000, value=380, step=10, help="Potential for losses exceeding expected loss (e.g., VaR at 99% confidence).")
-        max_severe_loss_events_input = st.slider("Max Severe Loss Events", min_value=0, max_value=20, value=5, step=1, help="Tolerance for the number of 'severe' operational loss events.")
-        kri_limit_input = st.slider("KRI Limit", min_value=0.0, max_value=100.0, value=55.0, step=0.5, help="Threshold for the Key Risk Indicator.")
-        risk_capacity_input = st.slider("Risk Capacity", min_value=0, max_value=100000, value=50000, step=1000, help="Total capital buffer available for losses.")
+        max_expected_loss_input = st.slider("Max Expected Loss ($EL$)", min_value=0, max_value=5000, value=DEFAULT_SETTINGS['max_expected_loss'], step=10, help="Maximum average loss an organization expects to incur.")
+        max_unexpected_loss_input = st.slider("Max Unexpected Loss ($UL$)", min_value=0, max_value=1000, value=DEFAULT_SETTINGS['max_unexpected_loss'], step=10, help="Potential for losses exceeding expected loss (e.g., VaR at 99% confidence).")
+        max_severe_loss_events_input = st.slider("Max Severe Loss Events", min_value=0, max_value=20, value=DEFAULT_SETTINGS['max_severe_loss_events'], step=1, help="Tolerance for the number of 'severe' operational loss events within the rolling window.")
+        severe_loss_threshold_input = st.slider("Severe Loss Threshold ($)", min_value=0, max_value=10000, value=DEFAULT_SETTINGS['severe_loss_threshold'], step=50, help="Loss amount above which an event counts as 'severe'.")
+        kri_limit_input = st.slider("KRI Limit", min_value=0.0, max_value=100.0, value=DEFAULT_SETTINGS['kri_limit'], step=0.5, help="Threshold for the Key Risk Indicator.")
+        risk_capacity_input = st.slider("Risk Capacity", min_value=0, max_value=100000, value=DEFAULT_SETTINGS['risk_capacity'], step=1000, help="Total capital buffer available for losses.")
+
+        st.subheader("3. Risk Profile Window")
+        profile_window_input = st.slider("Rolling Window (days)", min_value=1, max_value=365, value=DEFAULT_SETTINGS['window_days'], step=1, help="Number of days of loss events used for each day's Expected and Unexpected Loss.")
+        use_ewma_input = st.checkbox("Exponentially Weighted (EWMA)", value=DEFAULT_SETTINGS['use_ewma'], help="Weight recent losses more heavily instead of using a hard rolling window.")
+        ewma_halflife_input = st.slider("EWMA Half-life (days)", min_value=1, max_value=180, value=DEFAULT_SETTINGS['ewma_halflife'], step=1, disabled=not use_ewma_input, help="Number of days after which a loss carries half its original weight.")
+
+        st.subheader("4. Monte Carlo Settings")
+        mc_scenarios_input = st.select_slider("Number of Scenarios", options=[10_000, 100_000, 1_000_000, 10_000_000], value=DEFAULT_SETTINGS['mc_scenarios'], help="Number of simulated aggregate-loss scenarios. Runs expected to draw more than 100 million losses (scenarios x period x mean daily frequency) are refused.")
+        mc_period_input = st.slider("Aggregation Period (days)", min_value=1, max_value=365, value=DEFAULT_SETTINGS['mc_period_days'], step=1, help="Number of days of losses summed into each scenario.")
+        mc_confidence_input = st.multiselect("VaR Confidence Levels", options=[0.9, 0.95, 0.99, 0.995, 0.999], default=DEFAULT_SETTINGS['mc_confidence_levels'], help="Quantiles at which VaR and Expected Shortfall are reported.")
+        capacity_paths_input = st.select_slider("Capacity Paths", options=[250, 500, 1000, 2000], value=DEFAULT_SETTINGS['capacity_paths'], help="Number of simulated cumulative loss paths used for the time-to-exhaustion distribution.")
 
     # Consolidate user parameters into a dictionary for downstream functions
-    user_risk_appetite_params = {
-        'MaxExpectedLoss_Threshold': float(max_expected_loss_input),
-        'MaxUnexpectedLoss_Threshold': float(max_unexpected_loss_input),
-        'MaxSevereLossEvents_Threshold': int(max_severe_loss_events_input),
-        'KRI_Limit': float(kri_limit_input),
-        'RiskCapacity': float(risk_capacity_input)
-    }
-
-    @st.cache_data(show_spinner=False)
-    def calculate_risk_profile(df_simulated_operations, df_loss_events, user_parameters):
-        """Computes the organization's simulated risk profile over time."""
-        if df_simulated_operations.empty and df_loss_events.empty:
-            return pd.DataFrame()
-
-        try:
-            df_simulated_operations['Date'] = pd.to_datetime(df_simulated_operations['Date'])
-            if not df_loss_events.empty:
-                df_loss_events['Date'] = pd.to_datetime(df_loss_events['Date'])
-        except Exception as e:
-            st.error(f"Error converting dates: {e}")
-            raise e
-
-        # Create a copy for the risk profile to avoid modifying original df_simulated_operations
-        df_risk_profile = df_simulated_operations.copy()
-
-        # Calculate Expected Loss (EL)
-        # EL is constant over the period for this simulation, based on overall mean loss
-        df_risk_profile['ExpectedLoss'] = df_loss_events['LossAmount'].mean() if not df_loss_events.empty else 0
-
-        # Calculate Unexpected Loss (UL) - Simple example: standard deviation
-        # UL is constant over the period for this simulation, based on overall std dev of loss
-        df_risk_profile['UnexpectedLoss'] = df_loss_events['LossAmount'].std() if not df_loss_events.empty else 0
-
-        # Incorporate KRI values (flag if KRI exceeds limit)
-        if 'KRI' in df_risk_profile.columns and 'KRI_Limit' in user_parameters:
-            df_risk_profile.loc[:, 'KRI_Exceeded'] = df_risk_profile['KRI'] > user_parameters['KRI_Limit']
-
-        return df_risk_profile
-
-    @st.cache_data(show_spinner=False)
-    def monitor_risk_appetite(df_risk_profile, risk_appetite_params):
-        """Compares risk profile against risk appetite, identifies breaches and evaluates KRI status."""
-        if not isinstance(df_risk_profile, pd.DataFrame):
-            raise TypeError("df_risk_profile must be a Pandas DataFrame.")
-        if not isinstance(risk_appetite_params, dict):
-            raise TypeError("risk_appetite_params must be a dictionary.")
-
-        df_breaches = pd.DataFrame()
-        df_kri_status = pd.DataFrame()
-
-        if df_risk_profile.empty:
-            return df_breaches, df_kri_status
-
-        breach_data = []
-        kri_status_data = []
-
-        # Ensure 'Date' column is present for merging later
-        if 'Date' not in df_risk_profile.columns:
-            st.warning("Date column not found in df_risk_profile. Breach monitoring might be inaccurate.")
-            return pd.DataFrame(), pd.DataFrame() # Return empty if essential column is missing
-
-        for index, row in df_risk_profile.iterrows():
-            breaches = {'Date': row['Date']}
-            kri_status = {'Date': row['Date']}
-
-            # Expected Loss breach
-            if 'ExpectedLoss' in df_risk_profile.columns and 'MaxExpectedLoss_Threshold' in risk_appetite_params:
-                if row['ExpectedLoss'] > risk_appetite_params['MaxExpectedLoss_Threshold']:
-                    breaches['ExpectedLoss_Status'] = 'Breached'
-                else:
-                    breaches['ExpectedLoss_Status'] = 'Within Appetite'
-
-            # Unexpected Loss breach
-            if 'UnexpectedLoss' in df_risk_profile.columns and 'MaxUnexpectedLoss_Threshold' in risk_appetite_params:
-                if row['UnexpectedLoss'] > risk_appetite_params['MaxUnexpectedLoss_Threshold']:
-                    breaches['UnexpectedLoss_Status'] = 'Breached'
-                else:
-                    breaches['UnexpectedLoss_Status'] = 'Within Appetite'
-
-            # KRI Status
-            if 'KRI' in df_risk_profile.columns and 'KRI_Limit' in risk_appetite_params:
-                if row['KRI'] > risk_appetite_params['KRI_Limit']:
-                    kri_status['KRI_Status'] = 'Above Limit'
-                else:
-                    kri_status['KRI_Status'] = 'Within Limit'
-            else:
-                kri_status['KRI_Status'] = 'N/A' # Handle cases where KRI or KRI_Limit might be missing
-
-            breach_data.append(breaches)
-            kri_status_data.append(kri_status)
-
-        df_breaches = pd.DataFrame(breach_data)
-        df_kri_status = pd.DataFrame(kri_status_data)
-
-        return df_breaches, df_kri_status
+    user_risk_appetite_params = build_risk_appetite_params(
+        max_expected_loss_input, max_unexpected_loss_input, max_severe_loss_events_input,
+        severe_loss_threshold_input, kri_limit_input, risk_capacity_input
+    )
 
     # Load data from page 1 (simulated data)
-    if 'df_ops' in st.session_state and 'df_losses' in st.session_state:
-        df_ops = st.session_state['df_ops']
-        df_losses = st.session_state['df_losses']
+    if 'scenario' in st.session_state:
+        with stage('load scenario'):
+            try:
+                df_ops, loss_events = get_default_store().load(st.session_state['scenario'])
+            except KeyError:
+                st.warning("This scenario has been removed from the scenario store. Revisit the 'Data Generation & Visualization' page to regenerate it.")
+                st.stop()
 
         # Call the functions
-        df_risk_profile = calculate_risk_profile(df_ops, df_losses, user_risk_appetite_params)
+        df_risk_profile = calculate_risk_profile(
+            df_ops, loss_events, user_risk_appetite_params,
+            window_days=int(profile_window_input),
+            ewma_halflife=float(ewma_halflife_input) if use_ewma_input else None
+        )
         df_breaches, df_kri_status = monitor_risk_appetite(df_risk_profile, user_risk_appetite_params)
 
         st.subheader("Calculated Risk Profile")
-        st.write("This table shows the daily Expected Loss ($EL$), Unexpected Loss ($UL$), and KRI status calculated from the simulated data.")
+        st.write("This table shows the daily rolling-window Expected Loss ($EL$), Unexpected Loss ($UL$), number of severe loss events, and KRI status calculated from the simulated data.")
         st.dataframe(df_risk_profile.head())
 
+        if 'SevereLossEvents' in df_risk_profile.columns:
+            st.metric(
+                f"Most Severe Loss Events in Any {int(profile_window_input)}-Day Window",
+                int(df_risk_profile['SevereLossEvents'].max()),
+                delta=f"limit {user_risk_appetite_params['MaxSevereLossEvents_Threshold']}",
+                delta_color="off"
+            )
+
         st.subheader("Risk Appetite Monitoring")
-        st.write("These tables show whether Expected Loss, Unexpected Loss, and the KRI are within the defined appetite.")
+        st.write("These tables show whether Expected Loss, Unexpected Loss, severe loss events, and the KRI are within the defined appetite.")
 
         st.markdown("**Breach Status:**")
         st.dataframe(df_breaches.head())
@@ -143,58 +261,152 @@ def run_page2():
         st.markdown("**KRI Status:**")
         st.dataframe(df_kri_status.head())
 
-        st.subheader("Risk Profile vs. Risk Appetite")
-        st.write("Comparing calculated Expected Loss ($EL$) and Unexpected Loss ($UL$) against defined thresholds.")
-
-        # EL and UL Trend with Thresholds
-        if not df_risk_profile.empty:
-            df_risk_profile['Date'] = pd.to_datetime(df_risk_profile['Date'])
-            df_risk_profile_melted = df_risk_profile.melt(id_vars=['Date'], value_vars=['ExpectedLoss', 'UnexpectedLoss'], var_name='RiskMetric', value_name='Value')
-
-            # Add thresholds as separate data for plotting
-            threshold_data = pd.DataFrame({
-                'RiskMetric': ['ExpectedLoss', 'UnexpectedLoss'],
-                'Threshold': [user_risk_appetite_params['MaxExpectedLoss_Threshold'], user_risk_appetite_params['MaxUnexpectedLoss_Threshold']]
-            })
-
-            chart_risk_profile = alt.Chart(df_risk_profile_melted).mark_line().encode(
-                x=alt.X('Date:T', title='Date'),
-                y=alt.Y('Value:Q', title='Loss Amount ($)'),
-                color=alt.Color('RiskMetric:N', title='Risk Metric', scale=alt.Scale(range=['#17becf', '#e377c2']))
-            ).properties(
-                title='Expected and Unexpected Loss Over Time'
-            )
-
-            # Add threshold lines
-            threshold_lines = alt.Chart(threshold_data).mark_rule(strokeDash=[3, 3]).encode(
-                y='Threshold:Q',
-                color=alt.Color('RiskMetric:N', title='Threshold For', scale=alt.Scale(range=['#17becf', '#e377c2'])),
-                tooltip=[alt.Tooltip('Threshold:Q', title='Threshold')]
-            )
-            st.altair_chart(chart_risk_profile + threshold_lines, use_container_width=True)
+        with stage('render profile charts'):
+            st.subheader("Risk Profile vs. Risk Appetite")
+            st.write("Comparing calculated Expected Loss ($EL$) and Unexpected Loss ($UL$) against defined thresholds.")
+
+            # EL and UL Trend with Thresholds
+            if not df_risk_profile.empty:
+                # Downsample and fold server-side so the chart payload stays bounded for long horizons
+                df_risk_profile_sampled = downsample(df_risk_profile, 'Date', ['ExpectedLoss', 'UnexpectedLoss'])
+                df_risk_profile_melted = fold_metrics(df_risk_profile_sampled, 'Date', ['ExpectedLoss', 'UnexpectedLoss'], var_name='RiskMetric')
+
+                # Add thresholds as separate data for plotting
+                threshold_data = pd.DataFrame({
+                    'RiskMetric': ['ExpectedLoss', 'UnexpectedLoss'],
+                    'Threshold': [user_risk_appetite_params['MaxExpectedLoss_Threshold'], user_risk_appetite_params['MaxUnexpectedLoss_Threshold']]
+                })
+
+                chart_risk_profile = alt.Chart(df_risk_profile_melted).mark_line().encode(
+                    x=alt.X('Date:T', title='Date'),
+                    y=alt.Y('Value:Q', title='Loss Amount ($)'),
+                    color=alt.Color('RiskMetric:N', title='Risk Metric', scale=alt.Scale(range=['#17becf', '#e377c2']))
+                ).properties(
+                    title='Expected and Unexpected Loss Over Time'
+                )
+
+                # Add threshold lines
+                threshold_lines = alt.Chart(threshold_data).mark_rule(strokeDash=[3, 3]).encode(
+                    y='Threshold:Q',
+                    color=alt.Color('RiskMetric:N', title='Threshold For', scale=alt.Scale(range=['#17becf', '#e377c2'])),
+                    tooltip=[alt.Tooltip('Threshold:Q', title='Threshold')]
+                )
+                st.altair_chart(chart_risk_profile + threshold_lines, use_container_width=True)
+            else:
+                st.info("Risk profile could not be calculated. Please check data generation parameters.")
+
+            # Combine df_risk_profile and df_breaches for a single KRI status plot if desired
+            if not df_risk_profile.empty and not df_kri_status.empty:
+                df_kri_sampled = downsample(df_risk_profile[['Date', 'KRI']], 'Date', ['KRI'])
+                df_combined_kri = df_kri_sampled.merge(df_kri_status, on='Date', how='left')
+
+                kri_chart = alt.Chart(df_combined_kri).mark_line().encode(
+                    x=alt.X('Date:T', title='Date'),
+                    y=alt.Y('KRI:Q', title='KRI Value'),
+                    color=alt.Color('KRI_Status:N', title='KRI Status',
+                                    scale=alt.Scale(domain=['Within Limit', 'Above Limit', 'N/A'], range=['#2ca02c', '#d62728', '#7f7f7f']))
+                ).properties(
+                    title='KRI Performance Against Limit'
+                )
+
+                kri_limit_rule = alt.Chart(pd.DataFrame({'limit': [user_risk_appetite_params['KRI_Limit']]} )).mark_rule(strokeDash=[5,5], color='#d62728').encode(
+                    y=alt.Y('limit', title='KRI Limit')
+                )
+                st.altair_chart(kri_chart + kri_limit_rule, use_container_width=True)
+
+        st.subheader("Monte Carlo Aggregate Loss (VaR / ES)")
+        st.write("Aggregate losses are simulated from the page 1 frequency and severity parameters. Value-at-Risk (VaR) is the loss quantile at each confidence level, Expected Shortfall (ES) is the average loss beyond it, and Unexpected Loss is VaR minus Expected Loss.")
+        sim_params = st.session_state.get('sim_params')
+        if sim_params is None:
+            st.info("Regenerate data on the 'Data Generation & Visualization' page to enable the Monte Carlo analysis.")
+        elif not mc_confidence_input:
+            st.info("Select at least one VaR confidence level.")
         else:
-            st.info("Risk profile could not be calculated. Please check data generation parameters.")
-
-        # Combine df_risk_profile and df_breaches for a single KRI status plot if desired
-        if not df_risk_profile.empty and not df_kri_status.empty:
-            df_combined_kri = df_risk_profile.merge(df_kri_status, on='Date', how='left')
-
-            kri_chart = alt.Chart(df_combined_kri).mark_line().encode(
-                x=alt.X('Date:T', title='Date'),
-                y=alt.Y('KRI:Q', title='KRI Value'),
-                color=alt.Color('KRI_Status:N', title='KRI Status',
-                                scale=alt.Scale(domain=['Within Limit', 'Above Limit'], range=['#2ca02c', '#d62728']))
+            try:
+                with st.spinner("Running Monte Carlo simulation..."):
+                    df_mc_risk = calculate_monte_carlo_risk(
+                        int(mc_scenarios_input), sim_params['loss_freq_params'], sim_params['loss_sev_params'],
+                        int(mc_period_input), tuple(sorted(mc_confidence_input)), sim_params['seed']
+                    )
+                st.dataframe(df_mc_risk)
+            except ValueError as e:
+                st.error(f"Monte Carlo run too large: {e}")
+
+        st.subheader("Risk Capacity Consumption")
+        st.write("Cumulative losses since the start of the scenario are compared against the Risk Capacity buffer. Capacity is exhausted on the first day cumulative losses reach it.")
+        risk_capacity = user_risk_appetite_params['RiskCapacity']
+        cumulative_losses = calculate_cumulative_losses(loss_events)
+        day_exhausted = exhaustion_day(cumulative_losses, risk_capacity)
+
+        col_consumed, col_exhausted = st.columns(2)
+        col_consumed.metric(
+            "Capacity Consumed",
+            f"{cumulative_losses[-1] / risk_capacity:.0%}" if risk_capacity > 0 else "n/a",
+            delta=f"${cumulative_losses[-1]:,.0f} of ${risk_capacity:,.0f}", delta_color="off"
+        )
+        col_exhausted.metric(
+            "Capacity Exhausted On",
+            "Not exhausted" if day_exhausted is None else str(pd.Timestamp(df_ops['Date'].iloc[day_exhausted]).date())
+        )
+
+        df_cumulative = downsample(pd.DataFrame({'Date': df_ops['Date'].values, 'CumulativeLoss': cumulative_losses}), 'Date', ['CumulativeLoss'])
+        chart_cumulative = alt.Chart(df_cumulative).mark_line(color='#8c564b').encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('CumulativeLoss:Q', title='Cumulative Loss ($)')
+        ).properties(
+            title='Cumulative Losses Against Risk Capacity'
+        )
+        capacity_rule = alt.Chart(pd.DataFrame({'capacity': [risk_capacity]})).mark_rule(strokeDash=[5, 5], color='#d62728').encode(
+            y=alt.Y('capacity', title='Risk Capacity')
+        )
+        st.altair_chart(chart_cumulative + capacity_rule, use_container_width=True)
+
+        if sim_params is not None:
+            with st.spinner("Simulating cumulative loss paths..."):
+                capacity_paths = calculate_capacity_paths(
+                    int(capacity_paths_input), len(cumulative_losses),
+                    sim_params['loss_freq_params'], sim_params['loss_sev_params'], sim_params['seed']
+                )
+            df_exhaustion = capacity_paths.exhaustion_distribution(risk_capacity)
+            probability_exhausted = float(df_exhaustion['CumulativeProbability'].iloc[-1])
+            median_day = int(np.searchsorted(df_exhaustion['CumulativeProbability'].to_numpy(), 0.5)) + 1
+
+            st.markdown(f"**Time to Exhaustion across {capacity_paths.n_paths:,} Monte Carlo paths:**")
+            if capacity_paths.n_paths < int(capacity_paths_input):
+                st.caption(f"Reduced from {int(capacity_paths_input):,} paths to keep {len(cumulative_losses):,}-day paths within memory; the probabilities are less precise.")
+            col_probability, col_median = st.columns(2)
+            col_probability.metric("Probability of Exhaustion within Horizon", f"{probability_exhausted:.1%}")
+            col_median.metric("Median Time to Exhaustion", f"{median_day} days" if probability_exhausted >= 0.5 else "Beyond horizon")
+
+            chart_exhaustion = alt.Chart(downsample(df_exhaustion, 'Day', ['CumulativeProbability'])).mark_area(color='#d62728', opacity=0.4).encode(
+                x=alt.X('Day:Q', title='Days from Scenario Start'),
+                y=alt.Y('CumulativeProbability:Q', title='Probability Capacity Is Exhausted', scale=alt.Scale(domain=[0, 1]))
             ).properties(
-                title='KRI Performance Against Limit'
-            )
-
-            kri_limit_rule = alt.Chart(pd.DataFrame({'limit': [user_risk_appetite_params['KRI_Limit']]} )).mark_rule(strokeDash=[5,5], color='#d62728').encode(
-                y=alt.Y('limit', title='KRI Limit')
+                title='Probability of Exhausting Risk Capacity Over Time'
             )
-            st.altair_chart(kri_chart + kri_limit_rule, use_container_width=True)
+            st.altair_chart(chart_exhaustion, use_container_width=True)
     else:
         st.info("Please generate data on the 'Data Generation & Visualization' page first.")
 
+    st.subheader("Live Loss Feed")
+    st.write("Monitor a live stream of loss events and KRI readings instead of simulated data. Point the feed at a file that is being appended to, or at `host:port` of a local socket, sending one record per line as JSON (`{\"type\": \"loss\", \"date\": \"2024-03-01\", \"amount\": 1830.5}`, `{\"type\": \"kri\", \"date\": \"2024-03-01\", \"value\": 57.2}`) or CSV (`type,date,value`). Thresholds and the rolling window are fixed when the feed starts.")
+    feed = st.session_state.get('live_feed')
+    live_source_input = st.text_input("Feed Source", value=feed.source if feed else "", placeholder="losses.ndjson or 127.0.0.1:9000", help="File to tail, or host:port of a local socket.")
+    col_start, col_stop = st.columns(2)
+    if col_start.button("Start Feed", disabled=not live_source_input or (feed is not None and feed.running)):
+        feed = LiveFeed(
+            live_source_input, user_risk_appetite_params,
+            window_days=int(profile_window_input),
+            ewma_halflife=float(ewma_halflife_input) if use_ewma_input else None
+        )
+        feed.start()
+        st.session_state['live_feed'] = feed
+        st.session_state.pop('live_tail', None)
+    if col_stop.button("Stop Feed", disabled=feed is None or not feed.running):
+        feed.stop()
+    if feed is not None:
+        live_feed_panel()
+
     # References section (moved from previous References page)
     st.header("References")
     st.markdown("""
@@ -0,0 +1,146 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+from datetime import datetime
+
+from risk_engine.cache import memoize
+from risk_engine.chart_data import downsample, fold_metrics
+from risk_engine.distributions import SEVERITY_MODELS
+from risk_engine.instrumentation import stage, timed
+from risk_engine.portfolio import breach_summary, equicorrelation, evaluate_portfolio_breaches, simulate_portfolio
+
+
+def default_line_settings(n_lines):
+    """Returns the editable per-line settings table, spreading loss frequencies across lines."""
+    return pd.DataFrame({
+        'BusinessLine': [f"Line {i + 1}" for i in range(n_lines)],
+        'GrowthRate': 0.0005,
+        'LossFrequencyMean': np.round(np.linspace(1.0, 4.0, n_lines), 1),
+        'LossSeverityMean': 1200.0,
+        'LossSeverityStd': 300.0,
+        'MaxExpectedLoss': 1300.0,
+        'MaxUnexpectedLoss': 380.0,
+        'KRILimit': 55.0,
+    })
+
+
+@timed()
+@memoize()
+def generate_portfolio(start_date, end_date, df_line_settings, severity_model, n_kris, kri_mean, kri_std, kri_correlation, seed):
+    """Simulates the business line x date panel for the settings table."""
+    lines = [
+        {
+            'name': row.BusinessLine,
+            'growth_rate': row.GrowthRate,
+            'loss_freq_params': {'model': 'Poisson', 'mean': row.LossFrequencyMean, 'std': 1.0},
+            'loss_sev_params': {'model': severity_model, 'mean': row.LossSeverityMean, 'std': row.LossSeverityStd},
+        }
+        for row in df_line_settings.itertuples(index=False)
+    ]
+    kri_params = {
+        'names': [f"KRI {k + 1}" for k in range(n_kris)],
+        'means': kri_mean,
+        'stds': kri_std,
+        'correlation': equicorrelation(n_kris, kri_correlation),
+    }
+    return simulate_portfolio(start_date, end_date, lines, kri_params, rng=np.random.default_rng(seed))
+
+
+@timed(rows=lambda panel, *args: panel.kri.size)
+@memoize()
+def monitor_portfolio(panel, df_line_settings, window_days):
+    """Evaluates every line's appetite limits over the whole panel and summarises the breaches."""
+    limits = {
+        'MaxExpectedLoss_Threshold': df_line_settings['MaxExpectedLoss'].to_numpy(dtype=np.float64),
+        'MaxUnexpectedLoss_Threshold': df_line_settings['MaxUnexpectedLoss'].to_numpy(dtype=np.float64),
+        # One KRI limit per line, applied to all of that line's KRIs
+        'KRI_Limit': df_line_settings['KRILimit'].to_numpy(dtype=np.float64)[:, None],
+    }
+    return breach_summary(panel, evaluate_portfolio_breaches(panel, limits, window_days))
+
+
+def run_page4():
+    st.header("Portfolio Monitoring")
+    st.markdown("""
+    Simulate many business lines at once, each with its own loss profile, several correlated Key Risk Indicators and its own risk appetite limits.
+
+    - Use the sidebar to choose the number of business lines and KRIs, and how strongly the KRIs move together.
+    - Edit the business line table to set each line's loss parameters and appetite limits.
+    - The heatmap shows the share of days each line breached each limit.
+    - The breach table lists the lines and measures with the most breach days.
+    """)
+
+    with st.sidebar:
+        st.subheader("Portfolio Parameters")
+        col_start, col_end = st.columns(2)
+        with col_start:
+            start_date = st.date_input("Portfolio Start Date", value=datetime(2022, 1, 1), help="Start date for the portfolio simulation.")
+        with col_end:
+            end_date = st.date_input("Portfolio End Date", value=datetime(2022, 12, 31), help="End date for the portfolio simulation.")
+        n_lines = st.slider("Business Lines", min_value=1, max_value=50, value=8, step=1, help="Number of business lines in the portfolio.")
+        severity_model = st.selectbox("Severity Model", options=list(SEVERITY_MODELS), index=0, help="Distribution of individual loss amounts for every line.")
+
+        st.markdown("**KRI Parameters**")
+        n_kris = st.slider("KRIs per Line", min_value=1, max_value=30, value=5, step=1, help="Number of Key Risk Indicators monitored for each line.")
+        kri_mean = st.slider("KRI Baseline", min_value=10.0, max_value=100.0, value=50.0, step=1.0, help="Average level of every KRI.")
+        kri_std = st.slider("KRI Volatility", min_value=1.0, max_value=20.0, value=5.0, step=0.5, help="Variability of every KRI.")
+        kri_correlation = st.slider("KRI Correlation", min_value=0.0, max_value=0.95, value=0.5, step=0.05, help="Correlation between any two KRIs of the same line on the same day.")
+        window_days = st.slider("Rolling Window (days)", min_value=1, max_value=365, value=30, step=1, key="portfolio_window", help="Number of days of loss events used for each line's Expected and Unexpected Loss.")
+        seed = st.number_input("Random Seed", min_value=0, max_value=2**32 - 1, value=42, step=1, key="portfolio_seed", help="Seed for the random number generator.")
+
+    if not isinstance(start_date, datetime):
+        start_date = datetime.combine(start_date, datetime.min.time())
+    if not isinstance(end_date, datetime):
+        end_date = datetime.combine(end_date, datetime.min.time())
+
+    st.subheader("Business Lines and Appetite Limits")
+    df_line_settings = st.data_editor(default_line_settings(n_lines), hide_index=True, disabled=['BusinessLine'], key=f"portfolio_lines_{n_lines}")
+
+    try:
+        panel = generate_portfolio(
+            start_date, end_date, df_line_settings, severity_model,
+            int(n_kris), float(kri_mean), float(kri_std), float(kri_correlation), int(seed)
+        )
+    except ValueError as e:
+        st.error(f"Invalid portfolio parameters: {e}")
+        return
+    df_summary = monitor_portfolio(panel, df_line_settings, int(window_days))
+
+    n_lines, n_kris, n_days = panel.shape
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Line-Days Simulated", f"{n_lines * n_days:,}")
+    col2.metric("KRI Readings", f"{n_lines * n_kris * n_days:,}")
+    col3.metric("Line-Measures Ever Breached", f"{int((df_summary['BreachDays'] > 0).sum())} / {len(df_summary)}")
+
+    with stage('render charts'):
+        st.subheader("Breach Rate by Line and Measure")
+        heatmap = alt.Chart(df_summary).mark_rect().encode(
+            x=alt.X('Measure:N', title='Measure', sort=None),
+            y=alt.Y('BusinessLine:N', title='Business Line', sort=None),
+            color=alt.Color('BreachRate:Q', title='Share of Days Breached', scale=alt.Scale(scheme='reds')),
+            tooltip=['BusinessLine', 'Measure', 'BreachDays', alt.Tooltip('BreachRate:Q', format='.1%'), 'LastBreach']
+        ).properties(
+            title='Share of Days Each Limit Was Breached'
+        )
+        st.altair_chart(heatmap, use_container_width=True)
+
+        st.subheader("Most Frequent Breaches")
+        st.dataframe(df_summary.sort_values('BreachDays', ascending=False).head(20), hide_index=True)
+
+        st.subheader("Expected Loss by Business Line")
+        expected_loss, _ = panel.rolling_risk(int(window_days))
+        df_expected_loss = pd.DataFrame(expected_loss.T, columns=panel.line_names)
+        df_expected_loss.insert(0, 'Date', panel.dates)
+        df_expected_loss_long = fold_metrics(
+            downsample(df_expected_loss, 'Date', panel.line_names), 'Date', panel.line_names,
+            var_name='BusinessLine', value_name='ExpectedLoss'
+        )
+        chart_expected_loss = alt.Chart(df_expected_loss_long).mark_line().encode(
+            x=alt.X('Date:T', title='Date'),
+            y=alt.Y('ExpectedLoss:Q', title='Expected Loss ($)'),
+            color=alt.Color('BusinessLine:N', title='Business Line', sort=None)
+        ).properties(
+            title='Rolling Expected Loss per Business Line'
+        )
+        st.altair_chart(chart_expected_loss, use_container_width=True)
@@ -0,0 +1,97 @@
+"""Precomputes the default scenario so the first visitor gets cache hits instead of cold computations.
+
+``warm_up`` runs the page pipelines once with the sidebar defaults, filling
+the scenario store and the compute cache of this process. It runs twice per
+container:
+
+- The Dockerfile runs this module before ``streamlit run``, so the default
+  scenario is already on disk when the server starts::
+
+      python -m application_pages.warmup
+
+- The compute cache lives in the server process, and Streamlit runs no app
+  code until the first session connects (it has no server-start hook), so
+  ``app.py`` repeats the warm-up in a background thread after the first
+  script run. The scenario then loads from the store and only the page 2
+  results (Monte Carlo, capacity paths) are computed, which mostly run in
+  NumPy with the GIL released. Set ``QULAB_WARMUP=0`` to disable it.
+"""
+import os
+import threading
+import time
+
+from risk_engine.instrumentation import record_run, startup
+
+WARMUP_ENV = 'QULAB_WARMUP'
+
+
+def warm_up():
+    """Loads the default scenario and computes every default page result; returns the run's ``RunRecord``."""
+    from application_pages.page1 import DEFAULT_PARAMS, build_scenario_params, generate_synthetic_data, prepare_chart_data
+    from application_pages.page2 import (
+        DEFAULT_SETTINGS, build_risk_appetite_params, calculate_capacity_paths, calculate_cumulative_losses,
+        calculate_monte_carlo_risk, calculate_risk_profile, monitor_risk_appetite
+    )
+    from risk_engine.store import get_default_store, scenario_key
+    import pandas as pd
+
+    started = time.perf_counter()
+    with record_run('warm-up') as run:
+        # Page 1: same parameters, key and calls as the default sidebar
+        scenario_params = build_scenario_params(DEFAULT_PARAMS)
+        loss_freq_params, loss_sev_params, seed = scenario_params[3], scenario_params[4], scenario_params[6]
+        scenario_store = get_default_store()
+        scenario = scenario_store.get_or_create(
+            scenario_key(*scenario_params),
+            lambda: generate_synthetic_data(*scenario_params),
+            scenario_params
+        )
+        df_ops, loss_events = scenario_store.load(scenario)
+        df_ops['Date'] = pd.to_datetime(df_ops['Date'])
+        prepare_chart_data(df_ops, loss_events)
+
+        # Page 2
+        settings = DEFAULT_SETTINGS
+        risk_appetite_params = build_risk_appetite_params(
+            settings['max_expected_loss'], settings['max_unexpected_loss'], settings['max_severe_loss_events'],
+            settings['severe_loss_threshold'], settings['kri_limit'], settings['risk_capacity']
+        )
+        df_risk_profile = calculate_risk_profile(
+            df_ops, loss_events, risk_appetite_params,
+            window_days=int(settings['window_days']),
+            ewma_halflife=float(settings['ewma_halflife']) if settings['use_ewma'] else None
+        )
+        monitor_risk_appetite(df_risk_profile, risk_appetite_params)
+        calculate_monte_carlo_risk(
+            int(settings['mc_scenarios']), loss_freq_params, loss_sev_params,
+            int(settings['mc_period_days']), tuple(sorted(settings['mc_confidence_levels'])), seed
+        )
+        cumulative_losses = calculate_cumulative_losses(loss_events)
+        calculate_capacity_paths(int(settings['capacity_paths']), len(cumulative_losses), loss_freq_params, loss_sev_params, seed)
+    startup['warmup_seconds'] = time.perf_counter() - started
+    return run
+
+
+def _warm_up_quietly():
+    try:
+        warm_up()
+    except Exception as e:
+        # A failed warm-up only costs the first visitor the cold computation
+        startup['warmup_error'] = f"{type(e).__name__}: {e}"
+
+
+def start_background_warm_up():
+    """Runs ``warm_up`` in a daemon thread unless ``$QULAB_WARMUP`` is ``0``; returns the thread, or ``None``."""
+    if os.environ.get(WARMUP_ENV, '1') == '0':
+        return None
+    thread = threading.Thread(target=_warm_up_quietly, name='qulab-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    from risk_engine.store import get_default_store
+
+    run = warm_up()
+    print(run.to_frame().to_string(index=False))
+    print(f"Warm-up finished in {run.seconds:.2f}s; scenario store at {get_default_store().root}")
@@ -0,0 +1,183 @@
+"""Benchmarks the simulate -> risk profile -> monitor -> chart data pipeline without a Streamlit server.
+
+Usage::
+
+    python benchmarks/bench_pipeline.py --output bench.json
+    python benchmarks/bench_pipeline.py --quick --compare bench.json
+
+Each stage is timed over ``--repeats`` runs (best and median wall time) and
+run once more under ``tracemalloc`` for peak memory. Results are written as
+JSON; ``--compare`` prints the wall-time ratio against an earlier results file.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from inspect import unwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from application_pages.page1 import generate_synthetic_data, prepare_chart_data
+from risk_engine.pipeline import build_risk_profile, evaluate_risk_appetite
+
+START_DATE = datetime(2000, 1, 1)
+
+HORIZONS = {
+    '1m': 31,
+    '1y': 365,
+    '10y': 3650,
+    '50y': 18250,
+}
+FREQUENCIES = [0.5, 2.0, 10.0, 100.0]
+QUICK_HORIZONS = ['1m', '1y', '10y']
+QUICK_FREQUENCIES = [0.5, 10.0]
+
+# Page 2 sidebar defaults
+APPETITE_PARAMS = {
+    'MaxExpectedLoss_Threshold': 1300.0,
+    'MaxUnexpectedLoss_Threshold': 380.0,
+    'MaxSevereLossEvents_Threshold': 5,
+    'SevereLoss_Threshold': 2000.0,
+    'KRI_Limit': 55.0,
+    'RiskCapacity': 50000.0,
+}
+
+
+def measure(func, repeats):
+    """Returns ``(result, wall_times, peak_bytes)`` for ``func``; the memory run is separate from timing."""
+    wall_times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        wall_times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall_times, peak_bytes
+
+
+def bench_case(horizon, frequency, repeats):
+    """Benchmarks every pipeline stage for one horizon and loss frequency."""
+    end_date = START_DATE + timedelta(days=HORIZONS[horizon] - 1)
+    # The page functions are memoized, and calculate_risk_profile calls the memoized
+    # build_severe_loss_index, so the engine functions behind them (or, for
+    # prepare_chart_data, the unwrapped function) are timed instead; the compute
+    # cache never short-circuits a run and no cache keys are hashed
+    stages = []
+
+    def record(stage, func, rows):
+        result, wall_times, peak_bytes = measure(func, repeats)
+        best = min(wall_times)
+        stages.append({
+            'stage': stage,
+            'horizon': horizon,
+            'loss_frequency': frequency,
+            'rows': rows(result),
+            'wall_seconds_best': best,
+            'wall_seconds_median': statistics.median(wall_times),
+            'peak_memory_mib': peak_bytes / 1024 ** 2,
+            'rows_per_second': rows(result) / best if best > 0 else None,
+        })
+        return result
+
+    df_ops, loss_events = record('generate_synthetic_data', lambda: generate_synthetic_data(
+        START_DATE, end_date,
+        {'growth_rate': 0.02},
+        {'model': 'Poisson', 'mean': frequency, 'std': 1.0},
+        {'model': 'Normal', 'mean': 1200.0, 'std': 300.0},
+        {'baseline': 50.0, 'volatility': 5.0},
+        seed=42
+    ), lambda result: len(result[0]) + len(result[1]))
+    df_risk_profile = record('calculate_risk_profile', lambda: build_risk_profile(
+        df_ops, loss_events, APPETITE_PARAMS
+    ), lambda result: len(df_ops) + len(loss_events))
+    record('monitor_risk_appetite', lambda: evaluate_risk_appetite(
+        df_risk_profile, APPETITE_PARAMS
+    ), lambda result: len(df_risk_profile))
+    record('prepare_chart_data', lambda: unwrap(prepare_chart_data)(
+        df_ops, loss_events
+    ), lambda result: len(df_ops) + len(loss_events))
+    return stages
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Prints the best-wall-time ratio of each stage against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = {
+            (row['stage'], row['horizon'], row['loss_frequency']): row
+            for row in json.load(f)['results']
+        }
+    print(f"\n{'stage':<26}{'horizon':>8}{'freq':>8}{'baseline s':>13}{'current s':>12}{'ratio':>8}")
+    for row in results:
+        previous = baseline.get((row['stage'], row['horizon'], row['loss_frequency']))
+        if previous is None:
+            continue
+        ratio = row['wall_seconds_best'] / previous['wall_seconds_best'] if previous['wall_seconds_best'] else float('nan')
+        print(f"{row['stage']:<26}{row['horizon']:>8}{row['loss_frequency']:>8}"
+              f"{previous['wall_seconds_best']:>13.4f}{row['wall_seconds_best']:>12.4f}{ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the risk appetite compute pipeline.")
+    parser.add_argument('-o', '--output', default='bench_results.json', help="JSON file to write results to.")
+    parser.add_argument('-r', '--repeats', type=int, default=3, help="Timed repetitions per stage.")
+    parser.add_argument('--horizons', nargs='+', choices=list(HORIZONS), default=None, help="Date horizons to run.")
+    parser.add_argument('--frequencies', nargs='+', type=float, default=None, help="Loss events per day to run.")
+    parser.add_argument('--quick', action='store_true', help="Run a reduced matrix for a fast smoke check.")
+    parser.add_argument('--compare', default=None, help="Earlier results JSON to compare wall times against.")
+    args = parser.parse_args(argv)
+
+    horizons = args.horizons or (QUICK_HORIZONS if args.quick else list(HORIZONS))
+    frequencies = args.frequencies or (QUICK_FREQUENCIES if args.quick else FREQUENCIES)
+
+    results = []
+    for horizon in horizons:
+        for frequency in frequencies:
+            for row in bench_case(horizon, frequency, args.repeats):
+                results.append(row)
+                print(f"{row['stage']:<26}{horizon:>5}{frequency:>7}  {row['wall_seconds_best']:.4f}s"
+                      f"  {row['peak_memory_mib']:.1f} MiB  {row['rows_per_second']:,.0f} rows/s")
+
+    report = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeats': args.repeats,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
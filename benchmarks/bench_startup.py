@@ -0,0 +1,88 @@
+"""Benchmarks container cold start: module import times in fresh interpreters and the default-scenario warm-up.
+
+Usage::
+
+    python benchmarks/bench_startup.py --output startup.json
+
+Every target is timed in a new Python process (best and median of
+``--repeats``), so nothing is already imported or cached. ``app shell`` is
+what ``app.py`` imports before the first page renders; each page target is
+the first visit's import. ``warm-up`` covers its imports plus the warm-up
+itself, run against a temporary scenario store.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_pipeline import git_revision
+
+IMPORT_TARGETS = {
+    'app shell': 'import streamlit, application_pages.warmup, risk_engine.instrumentation',
+    'page1': 'import application_pages.page1',
+    'page2': 'import application_pages.page2',
+    'page4': 'import application_pages.page4',
+}
+
+WARMUP_SNIPPET = "from application_pages.warmup import warm_up\nwarm_up()"
+
+
+def run_fresh(code, env=None):
+    """Runs ``code`` in a new interpreter and returns how many seconds it took, excluding interpreter startup."""
+    timed = f"import time\n_started = time.perf_counter()\n{code}\nprint(time.perf_counter() - _started)\n"
+    output = subprocess.run(
+        [sys.executable, '-c', timed], capture_output=True, text=True, check=True,
+        cwd=ROOT, env={**os.environ, 'PYTHONPATH': ROOT, **(env or {})}
+    ).stdout.split()
+    return float(output[-1])
+
+
+def measure(code, repeats, env=None):
+    timings = [run_fresh(code, env) for _ in range(repeats)]
+    return min(timings), statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's cold start.")
+    parser.add_argument('-o', '--output', default='startup_results.json', help="JSON file to write results to.")
+    parser.add_argument('-r', '--repeats', type=int, default=3, help="Fresh-process repetitions per target.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, code in IMPORT_TARGETS.items():
+        best, median = measure(code, args.repeats)
+        results.append({'target': name, 'kind': 'import', 'seconds_best': best, 'seconds_median': median})
+        print(f"{'import ' + name:<24}{best:>8.3f}s  (median {median:.3f}s)")
+
+    with tempfile.TemporaryDirectory() as scenario_dir:
+        # The first warm-up generates the scenario, later ones reload it from the store
+        timings = [run_fresh(WARMUP_SNIPPET, {'QULAB_SCENARIO_DIR': scenario_dir}) for _ in range(args.repeats)]
+    results.append({'target': 'warm-up', 'kind': 'warm-up', 'seconds_cold_store': timings[0], 'seconds_best': min(timings)})
+    print(f"{'warm-up':<24}{min(timings):>8.3f}s  (empty store {timings[0]:.3f}s)")
+
+    report = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeats': args.repeats,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Streamlit-free compute engine behind the QuLab risk appetite pages."""
@@ -0,0 +1,68 @@
+import operator
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+COMPARATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+APPETITE_LABELS = ('Within Appetite', 'Breached')
+KRI_LABELS = ('Within Limit', 'Above Limit')
+# Status of a day whose metric is missing (NaN), e.g. a live feed day without a KRI reading
+MISSING_LABEL = 'N/A'
+
+BreachRule = namedtuple('BreachRule', ['column', 'threshold', 'comparator', 'status_column', 'labels'])
+BreachRule.__new__.__defaults__ = ('>', None, APPETITE_LABELS)
+BreachRule.__doc__ = """A risk appetite rule: ``column <comparator> threshold`` means the limit is breached.
+
+``labels`` is the ``(ok, breached)`` pair of status values; ``status_column``
+defaults to ``<column>_Status``.
+"""
+
+
+def evaluate_breaches(df_risk_profile, rules):
+    """Evaluates every rule against the risk profile in one columnar pass.
+
+    Returns a DataFrame with the ``Date`` column and one categorical status
+    column per rule whose metric column is present in ``df_risk_profile``.
+    Days where the metric is NaN are labelled ``MISSING_LABEL`` rather than
+    within appetite.
+    """
+    df_status = pd.DataFrame({'Date': df_risk_profile['Date'].values})
+    for rule in rules:
+        if rule.column not in df_risk_profile.columns:
+            continue
+        if rule.comparator not in COMPARATORS:
+            raise ValueError(f"Unknown comparator {rule.comparator!r}; expected one of {sorted(COMPARATORS)}.")
+        values = df_risk_profile[rule.column].to_numpy(dtype=np.float64)
+        codes = COMPARATORS[rule.comparator](values, rule.threshold).astype(np.int8)
+        codes[np.isnan(values)] = 2
+        status_column = rule.status_column or f"{rule.column}_Status"
+        df_status[status_column] = pd.Categorical.from_codes(codes, categories=list(rule.labels) + [MISSING_LABEL])
+    return df_status
+
+
+def appetite_rules(risk_appetite_params):
+    """Builds the breach rules for the thresholds set on the Risk Profile page."""
+    rule_specs = [
+        ('ExpectedLoss', 'MaxExpectedLoss_Threshold'),
+        ('UnexpectedLoss', 'MaxUnexpectedLoss_Threshold'),
+        ('SevereLossEvents', 'MaxSevereLossEvents_Threshold'),
+    ]
+    return [
+        BreachRule(column, risk_appetite_params[param])
+        for column, param in rule_specs
+        if param in risk_appetite_params
+    ]
+
+
+def kri_rules(risk_appetite_params):
+    """Builds the KRI limit rules for the thresholds set on the Risk Profile page."""
+    if 'KRI_Limit' not in risk_appetite_params:
+        return []
+    return [BreachRule('KRI', risk_appetite_params['KRI_Limit'], labels=KRI_LABELS)]
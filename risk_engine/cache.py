@@ -0,0 +1,223 @@
+import functools
+import hashlib
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from risk_engine.instrumentation import note_cache
+from risk_engine.losses import LossEvents
+
+CACHE_MAX_ENTRIES_ENV = 'QULAB_CACHE_MAX_ENTRIES'
+CACHE_MAX_BYTES_ENV = 'QULAB_CACHE_MAX_BYTES'
+CACHE_TTL_ENV = 'QULAB_CACHE_TTL_SECONDS'
+
+# Immutable argument types that are their own key
+_KEY_TYPES = (type(None), bool, int, float, complex, str, bytes, date, timedelta, np.generic)
+
+# Fingerprint tags by object id; kept outside the objects because pandas copies DataFrame.attrs into derived frames
+_tags = {}
+_tags_lock = threading.Lock()
+
+
+def _forget_tag(object_id):
+    with _tags_lock:
+        _tags.pop(object_id, None)
+
+
+def tag_fingerprint(value, tag):
+    """Makes ``fingerprint`` key this exact object by ``tag``; copies and frames derived from it are not tagged."""
+    with _tags_lock:
+        previous = _tags.get(id(value))
+        if previous is not None and previous[0]() is value:
+            previous[2].detach()
+        _tags[id(value)] = (weakref.ref(value), tag, weakref.finalize(value, _forget_tag, id(value)))
+    return value
+
+
+def _tag_of(value):
+    with _tags_lock:
+        entry = _tags.get(id(value))
+    if entry is not None and entry[0]() is value:
+        return entry[1]
+    return None
+
+
+def fingerprint(value):
+    """Reduces a function argument to a small hashable key.
+
+    DataFrames and ``LossEvents`` tagged with ``tag_fingerprint`` (scenario
+    loads and cached results) are keyed by that tag instead of being rehashed; untagged frames
+    and arrays fall back to hashing their contents. Other objects, such as a
+    ``PortfolioPanel``, are only accepted when a ``memoize``-d function returned
+    them; anything else raises ``TypeError`` rather than being keyed (and kept
+    alive) by identity.
+    """
+    if isinstance(value, _KEY_TYPES):
+        return value
+    if isinstance(value, pd.DataFrame):
+        tag = _tag_of(value)
+        if tag is not None:
+            return ('frame', tag)
+        # Row hashes in order, plus the labels and dtypes hash_pandas_object leaves out
+        row_hashes = pd.util.hash_pandas_object(value, index=False).to_numpy()
+        return ('frame', tuple(value.columns), tuple(str(dtype) for dtype in value.dtypes), fingerprint(row_hashes))
+    if isinstance(value, LossEvents):
+        tag = _tag_of(value)
+        if tag is not None:
+            return ('losses', tag)
+        return ('losses', str(value.start_date), value.n_days, fingerprint(value.day_offsets), fingerprint(value.amounts))
+    if isinstance(value, np.ndarray):
+        return ('array', value.shape, str(value.dtype), hashlib.sha1(np.ascontiguousarray(value).data).hexdigest())
+    if isinstance(value, dict):
+        return tuple(sorted((key, fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(fingerprint(item) for item in value)
+    tag = _tag_of(value)
+    if tag is not None:
+        return (type(value).__name__, tag)
+    raise TypeError(f"Cannot fingerprint a {type(value).__name__} argument; pass a memoized result or plain data.")
+
+
+def estimate_nbytes(value):
+    """Estimates the memory held by a cached value without a deep traversal of object columns."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(item) for item in value.values())
+    if hasattr(value, 'nbytes'):
+        # NumPy arrays and array-backed engine objects report their own buffer size
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count, total estimated bytes and optional TTL.
+
+    Values are returned by reference, not copied, so callers must treat them
+    as read-only.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=512 * 1024 ** 2, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns ``(True, value)`` on a hit and ``(False, None)`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.monotonic() - entry[2] > self.ttl_seconds:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            if nbytes > self.max_bytes:
+                # Larger than the whole budget; caching it would only evict everything else
+                return
+            self._entries[key] = (value, nbytes, time.monotonic())
+            self._nbytes += nbytes
+            while len(self._entries) > self.max_entries or self._nbytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._nbytes,
+            }
+
+
+def _tag_result(result, key):
+    """Stamps the objects in a result with a fingerprint derived from their cache key."""
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    items = enumerate(result) if isinstance(result, tuple) else [(None, result)]
+    for position, item in items:
+        if isinstance(item, _KEY_TYPES):
+            continue
+        try:
+            tag_fingerprint(item, digest if position is None else f"{digest}:{position}")
+        except TypeError:
+            # Objects that cannot be weakly referenced are left untagged
+            pass
+    return result
+
+
+def memoize(cache=None):
+    """Caches a function's results in ``cache`` (the shared compute cache by default).
+
+    Arguments are keyed with ``fingerprint``, and returned objects are tagged
+    so that passing them on to another memoized function is a cheap lookup too.
+    Each lookup is reported to the innermost active instrumentation stage.
+    The undecorated function stays available as ``__wrapped__``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache if cache is not None else get_compute_cache()
+            started = time.perf_counter()
+            key = (func.__module__, func.__qualname__, fingerprint(args), fingerprint(kwargs))
+            hit, value = target.get(key)
+            note_cache(hit, time.perf_counter() - started)
+            if hit:
+                return value
+            value = _tag_result(func(*args, **kwargs), key)
+            target.put(key, value)
+            return value
+        return wrapper
+    return decorator
+
+
+_compute_cache = None
+
+
+def get_compute_cache():
+    """Returns the process-wide compute cache, sized from the ``QULAB_CACHE_*`` environment variables."""
+    global _compute_cache
+    if _compute_cache is None:
+        ttl = os.environ.get(CACHE_TTL_ENV)
+        _compute_cache = LRUCache(
+            max_entries=int(os.environ.get(CACHE_MAX_ENTRIES_ENV, 64)),
+            max_bytes=int(os.environ.get(CACHE_MAX_BYTES_ENV, 512 * 1024 ** 2)),
+            ttl_seconds=float(ttl) if ttl else None
+        )
+    return _compute_cache
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from risk_engine.distributions import make_frequency, make_severity
+from risk_engine.montecarlo import DEFAULT_MAX_DRAWS_PER_CHUNK, _chunk_sizes
+
+# Upper bound on path-days held by one CapacityPaths index (8 bytes each, 64 MB in total)
+MAX_CAPACITY_PATH_CELLS = 8_000_000
+
+
+def cumulative_daily_losses(loss_events):
+    """Returns the running total of losses at the end of each day of a ``LossEvents`` container."""
+    daily_totals = np.bincount(loss_events.day_offsets, weights=loss_events.amounts, minlength=loss_events.n_days)
+    return np.cumsum(daily_totals)
+
+
+def exhaustion_day(cumulative_losses, capacity):
+    """Returns the first day offset on which cumulative losses reach ``capacity``, or ``None`` if they never do.
+
+    ``cumulative_losses`` must be non-decreasing, which holds for non-negative loss amounts.
+    """
+    day = int(np.searchsorted(cumulative_losses, capacity, side='left'))
+    return day if day < len(cumulative_losses) else None
+
+
+def _simulate_path_chunk(n_paths, n_days, frequency, severity, seed_seq):
+    """Simulates ``n_paths`` cumulative daily loss paths of ``n_days`` days."""
+    rng = np.random.default_rng(seed_seq)
+    counts = frequency.sample(n_paths * n_days, rng)
+    severities = severity.sample(int(counts.sum()), rng)
+    cell = np.repeat(np.arange(n_paths * n_days), counts)
+    daily_totals = np.bincount(cell, weights=severities, minlength=n_paths * n_days).reshape(n_paths, n_days)
+    return np.cumsum(daily_totals, axis=1)
+
+
+class CapacityPaths:
+    """Monte Carlo cumulative loss paths, indexed so the time to exhaust any capacity is a single binary search.
+
+    Each path is offset by ``path * stride`` (``stride`` exceeds every path's
+    total loss) and the paths are flattened into one sorted key array, the
+    same encoding ``SevereLossIndex`` uses for days. Querying a capacity is
+    then one ``searchsorted`` of ``n_paths`` keys, cheap enough to rerun on
+    every slider move.
+    """
+
+    def __init__(self, cumulative_losses, copy=True):
+        """With ``copy=False`` a C-contiguous float64 ``cumulative_losses`` is offset in place and becomes the index."""
+        cumulative_losses = np.asarray(cumulative_losses, dtype=np.float64)
+        if cumulative_losses.ndim != 2:
+            raise ValueError("cumulative_losses must be a (n_paths, n_days) array.")
+        self.n_paths, self.n_days = cumulative_losses.shape
+        self.final_losses = cumulative_losses[:, -1].copy() if self.n_days else np.zeros(self.n_paths)
+        self.stride = float(self.final_losses.max(initial=0.0)) + 1.0
+        self._path_offsets = np.arange(self.n_paths) * self.stride
+        if copy:
+            cumulative_losses = cumulative_losses.copy()
+        cumulative_losses += self._path_offsets[:, None]
+        self._keys = cumulative_losses.ravel()
+
+    @property
+    def nbytes(self):
+        return self._keys.nbytes + self.final_losses.nbytes + self._path_offsets.nbytes
+
+    def exhaustion_days(self, capacity):
+        """Returns, per path, the first day offset on which losses reach ``capacity`` (``n_days`` if never)."""
+        capacity = min(max(float(capacity), 0.0), self.stride)
+        positions = np.searchsorted(self._keys, self._path_offsets + capacity, side='left')
+        # Rounding in the offsets can spill a query onto the first keys of the next path
+        return np.minimum(positions - np.arange(self.n_paths) * self.n_days, self.n_days)
+
+    def exhaustion_distribution(self, capacity):
+        """Returns the probability that capacity is exhausted on each day and by each day, as a DataFrame."""
+        days = self.exhaustion_days(capacity)
+        probability = np.bincount(days, minlength=self.n_days + 1)[:self.n_days] / self.n_paths
+        return pd.DataFrame({
+            'Day': np.arange(1, self.n_days + 1),
+            'Probability': probability,
+            'CumulativeProbability': np.cumsum(probability),
+        })
+
+
+def paths_within_budget(n_paths, n_days, max_cells=MAX_CAPACITY_PATH_CELLS):
+    """Returns how many of ``n_paths`` paths of ``n_days`` days fit in ``max_cells`` path-days (at least one)."""
+    return max(1, min(n_paths, max_cells // max(n_days, 1)))
+
+
+def simulate_capacity_paths(n_paths, n_days, loss_freq_params, loss_sev_params, seed=None,
+                            max_draws_per_chunk=DEFAULT_MAX_DRAWS_PER_CHUNK, max_cells=MAX_CAPACITY_PATH_CELLS):
+    """Simulates ``n_paths`` cumulative daily loss paths over ``n_days`` days and indexes them as ``CapacityPaths``.
+
+    Paths are generated in chunks of bounded size with their own ``SeedSequence``
+    children, as in ``simulate_aggregate_losses``, and written straight into the
+    index array. Raises ValueError when ``n_paths * n_days`` exceeds
+    ``max_cells``; see ``paths_within_budget``.
+    """
+    if n_paths <= 0 or n_days <= 0:
+        raise ValueError("n_paths and n_days must be positive.")
+    if max_cells is not None and n_paths * n_days > max_cells:
+        raise ValueError(f"{n_paths:,} paths of {n_days:,} days exceed the {max_cells:,} path-days allowed.")
+    frequency = make_frequency(loss_freq_params)
+    severity = make_severity(loss_sev_params)
+    freq_mean = loss_freq_params.get('mean', 2) * n_days
+
+    sizes = _chunk_sizes(n_paths, freq_mean, max_draws_per_chunk)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    cumulative_losses = np.empty((n_paths, n_days))
+    row = 0
+    for size, seq in zip(sizes, child_seeds):
+        cumulative_losses[row:row + size] = _simulate_path_chunk(size, n_days, frequency, severity, seq)
+        row += size
+    return CapacityPaths(cumulative_losses, copy=False)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Roughly the pixel width of a full-width chart; more points than this cannot be seen
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_MAX_BINS = 30
+
+
+def lttb_indices(x, y, n_out):
+    """Selects ``n_out`` row indices with Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each bucket in between, the point
+    forming the largest triangle with the previously kept point and the mean of
+    the next bucket, which preserves the visual shape of the series.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        indices[bucket + 1] = previous
+    return indices
+
+
+def minmax_indices(y, n_buckets):
+    """Selects the row indices of the minimum and maximum of ``y`` in each of ``n_buckets`` buckets."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+
+    bucket_size = -(-n // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * bucket_size
+    filled_low = np.where(np.isnan(buckets[valid]), np.inf, buckets[valid])
+    filled_high = np.where(np.isnan(buckets[valid]), -np.inf, buckets[valid])
+    lows = offsets + filled_low.argmin(axis=1)
+    highs = offsets + filled_high.argmax(axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample(df, x_column, y_columns, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """Reduces a time series frame to at most about ``max_points`` rows per series for plotting.
+
+    ``method`` is ``'lttb'`` or ``'minmax'``. Rows picked for any of ``y_columns``
+    are kept, so every series stays aligned on the same x values.
+    """
+    if len(df) <= max_points:
+        return df
+    if method not in ('lttb', 'minmax'):
+        raise ValueError("method must be 'lttb' or 'minmax'.")
+
+    x = df[x_column]
+    x = x.to_numpy(dtype='datetime64[ns]').astype(np.int64) if pd.api.types.is_datetime64_any_dtype(x) else x.to_numpy()
+    per_series = max(max_points // len(y_columns), 3)
+    if method == 'lttb':
+        picked = [lttb_indices(x, df[column].to_numpy(), per_series) for column in y_columns]
+    else:
+        picked = [minmax_indices(df[column].to_numpy(), per_series // 2) for column in y_columns]
+    return df.iloc[np.unique(np.concatenate(picked))]
+
+
+def fold_metrics(df, id_column, value_columns, var_name='Metric', value_name='Value'):
+    """Melts ``value_columns`` into long format server-side instead of with a Vega-Lite fold."""
+    return df.melt(id_vars=[id_column], value_vars=list(value_columns), var_name=var_name, value_name=value_name)
+
+
+def bin_losses(loss_amounts, max_bins=DEFAULT_MAX_BINS):
+    """Pre-bins loss amounts into a histogram with ``BinStart``, ``BinEnd`` and ``Count`` columns."""
+    loss_amounts = np.asarray(loss_amounts, dtype=np.float64)
+    if loss_amounts.size == 0:
+        return pd.DataFrame({'BinStart': [], 'BinEnd': [], 'Count': []})
+    counts, edges = np.histogram(loss_amounts, bins=max_bins)
+    return pd.DataFrame({'BinStart': edges[:-1], 'BinEnd': edges[1:], 'Count': counts})
@@ -0,0 +1,295 @@
+import functools
+
+import numpy as np
+
+
+def _stats():
+    """Imports ``scipy.stats`` on first use; sampling never needs it and it dominates import time."""
+    from scipy import stats
+    return stats
+
+
+class Poisson:
+    """Poisson loss frequency; the standard deviation is fixed at ``sqrt(mean)``."""
+
+    def __init__(self, mean):
+        if mean < 0:
+            raise ValueError("Poisson mean must be non-negative.")
+        self.mean = float(mean)
+
+    @classmethod
+    def from_moments(cls, mean, std=None):
+        return cls(mean)
+
+    def sample(self, n, rng):
+        return rng.poisson(self.mean, n)
+
+    def pdf(self, k):
+        return _stats().poisson.pmf(k, self.mean)
+
+    def ppf(self, q):
+        return _stats().poisson.ppf(q, self.mean)
+
+    def scaled(self, periods):
+        """Returns the distribution of the total count over ``periods`` independent periods."""
+        return Poisson(self.mean * periods)
+
+
+class NegativeBinomial:
+    """Over-dispersed loss frequency with ``r`` successes and success probability ``p``."""
+
+    def __init__(self, r, p):
+        if r <= 0 or not 0 < p <= 1:
+            raise ValueError("Negative Binomial requires r > 0 and 0 < p <= 1.")
+        self.r = float(r)
+        self.p = float(p)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        variance = std ** 2
+        if variance <= mean:
+            raise ValueError("Negative Binomial frequency requires a variance (std^2) greater than the mean.")
+        return cls(mean ** 2 / (variance - mean), mean / variance)
+
+    def sample(self, n, rng):
+        return rng.negative_binomial(self.r, self.p, n)
+
+    def pdf(self, k):
+        return _stats().nbinom.pmf(k, self.r, self.p)
+
+    def ppf(self, q):
+        return _stats().nbinom.ppf(q, self.r, self.p)
+
+    def scaled(self, periods):
+        return NegativeBinomial(self.r * periods, self.p)
+
+
+class Binomial:
+    """Under-dispersed loss frequency: ``n`` trials with event probability ``p``."""
+
+    def __init__(self, n, p):
+        if n < 1 or not 0 <= p <= 1:
+            raise ValueError("Binomial requires n >= 1 and 0 <= p <= 1.")
+        self.n = int(n)
+        self.p = float(p)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        variance = std ** 2
+        if variance >= mean:
+            raise ValueError("Binomial frequency requires a variance (std^2) smaller than the mean.")
+        # Round the number of trials and re-derive p so the mean is matched exactly
+        n_trials = max(1, int(round(mean / (1 - variance / mean))))
+        return cls(n_trials, min(mean / n_trials, 1.0))
+
+    def sample(self, n, rng):
+        return rng.binomial(self.n, self.p, n)
+
+    def pdf(self, k):
+        return _stats().binom.pmf(k, self.n, self.p)
+
+    def ppf(self, q):
+        return _stats().binom.ppf(q, self.n, self.p)
+
+    def scaled(self, periods):
+        return Binomial(self.n * periods, self.p)
+
+
+class FoldedNormal:
+    """Normal loss severity folded at zero (``abs`` of a Normal draw)."""
+
+    def __init__(self, mean, std):
+        if std <= 0:
+            raise ValueError("Severity std must be positive.")
+        self.mean = float(mean)
+        self.std = float(std)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        return cls(mean, std)
+
+    def sample(self, n, rng):
+        return np.abs(rng.normal(self.mean, self.std, n))
+
+    @functools.cached_property
+    def _dist(self):
+        return _stats().foldnorm(abs(self.mean) / self.std, scale=self.std)
+
+    def pdf(self, x):
+        return self._dist.pdf(x)
+
+    def ppf(self, q):
+        return self._dist.ppf(q)
+
+
+class Lognormal:
+    """Lognormal loss severity with log-scale parameters ``mu`` and ``sigma``."""
+
+    def __init__(self, mu, sigma):
+        if sigma <= 0:
+            raise ValueError("Lognormal sigma must be positive.")
+        self.mu = float(mu)
+        self.sigma = float(sigma)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        if mean <= 0 or std <= 0:
+            raise ValueError("Lognormal severity requires a positive mean and std.")
+        sigma_sq = np.log1p((std / mean) ** 2)
+        return cls(np.log(mean) - sigma_sq / 2, np.sqrt(sigma_sq))
+
+    def sample(self, n, rng):
+        return rng.lognormal(self.mu, self.sigma, n)
+
+    @functools.cached_property
+    def _dist(self):
+        return _stats().lognorm(self.sigma, scale=np.exp(self.mu))
+
+    def pdf(self, x):
+        return self._dist.pdf(x)
+
+    def ppf(self, q):
+        return self._dist.ppf(q)
+
+
+class Gamma:
+    """Gamma loss severity with ``shape`` and ``scale``."""
+
+    def __init__(self, shape, scale):
+        if shape <= 0 or scale <= 0:
+            raise ValueError("Gamma shape and scale must be positive.")
+        self.shape = float(shape)
+        self.scale = float(scale)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        if mean <= 0 or std <= 0:
+            raise ValueError("Gamma severity requires a positive mean and std.")
+        return cls((mean / std) ** 2, std ** 2 / mean)
+
+    def sample(self, n, rng):
+        return rng.gamma(self.shape, self.scale, n)
+
+    @functools.cached_property
+    def _dist(self):
+        return _stats().gamma(self.shape, scale=self.scale)
+
+    def pdf(self, x):
+        return self._dist.pdf(x)
+
+    def ppf(self, q):
+        return self._dist.ppf(q)
+
+
+class GeneralizedPareto:
+    """Generalized Pareto (GPD) heavy-tail severity above ``loc`` with ``scale`` and tail index ``shape``."""
+
+    # Smallest tail index ``from_moments`` fits, so the tail stays heavy (and the variance finite)
+    MIN_SHAPE = 0.3
+
+    def __init__(self, shape, scale, loc=0.0):
+        if scale <= 0:
+            raise ValueError("GPD scale must be positive.")
+        self.shape = float(shape)
+        self.scale = float(scale)
+        self.loc = float(loc)
+
+    @classmethod
+    def from_moments(cls, mean, std):
+        """Matches ``mean`` and ``std`` exactly with a tail index of at least ``MIN_SHAPE``.
+
+        mean = loc + scale / (1 - shape) and std = scale / ((1 - shape) * sqrt(1 - 2 * shape)).
+        With ``loc = 0`` the shape is fixed by ``std / mean`` and turns negative
+        (a bounded tail) when std < mean, so the shape is floored at ``MIN_SHAPE``
+        and ``loc`` absorbs the difference; ``loc`` is never negative.
+        """
+        if mean <= 0 or std <= 0:
+            raise ValueError("GPD severity requires a positive mean and std.")
+        shape = max((1 - (mean / std) ** 2) / 2, cls.MIN_SHAPE)
+        scale = std * (1 - shape) * np.sqrt(1 - 2 * shape)
+        return cls(shape, scale, loc=max(mean - scale / (1 - shape), 0.0))
+
+    def sample(self, n, rng):
+        return self.ppf(rng.random(n))
+
+    @functools.cached_property
+    def _dist(self):
+        return _stats().genpareto(self.shape, loc=self.loc, scale=self.scale)
+
+    def pdf(self, x):
+        return self._dist.pdf(x)
+
+    def ppf(self, q):
+        q = np.asarray(q, dtype=np.float64)
+        if self.shape == 0:
+            return self.loc - self.scale * np.log1p(-q)
+        return self.loc + self.scale / self.shape * ((1 - q) ** -self.shape - 1)
+
+
+class Spliced:
+    """Body distribution below ``threshold`` spliced with a GPD tail above it.
+
+    A fraction ``tail_prob`` of losses come from the tail; the rest are drawn
+    from the body truncated at the threshold. ``from_moments`` fits the body
+    to the mean and std, so the heavier tail makes the spliced mean and std
+    somewhat higher than requested.
+    """
+
+    def __init__(self, body, tail_shape, tail_scale, threshold, tail_prob):
+        if not 0 < tail_prob < 1:
+            raise ValueError("tail_prob must be between 0 and 1.")
+        self.body = body
+        self.tail = GeneralizedPareto(tail_shape, tail_scale, loc=threshold)
+        self.threshold = float(threshold)
+        self.tail_prob = float(tail_prob)
+        self._body_mass = float(body._dist.cdf(threshold))
+
+    @classmethod
+    def from_moments(cls, mean, std, tail_prob=0.05, tail_shape=0.3):
+        body = Lognormal.from_moments(mean, std)
+        return cls(body, tail_shape, std, body.ppf(1 - tail_prob), tail_prob)
+
+    def sample(self, n, rng):
+        return self.ppf(rng.random(n))
+
+    def pdf(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        body_pdf = (1 - self.tail_prob) * self.body.pdf(x) / self._body_mass
+        return np.where(x <= self.threshold, body_pdf, self.tail_prob * self.tail.pdf(x))
+
+    def ppf(self, q):
+        q = np.asarray(q, dtype=np.float64)
+        body_q = np.minimum(q / (1 - self.tail_prob), 1.0) * self._body_mass
+        tail_q = np.clip((q - (1 - self.tail_prob)) / self.tail_prob, 0.0, 1.0)
+        return np.where(q < 1 - self.tail_prob, self.body.ppf(body_q), self.tail.ppf(tail_q))
+
+
+FREQUENCY_MODELS = {
+    'Poisson': Poisson,
+    'Negative Binomial': NegativeBinomial,
+    'Binomial': Binomial,
+}
+
+SEVERITY_MODELS = {
+    'Normal': FoldedNormal,
+    'Lognormal': Lognormal,
+    'Gamma': Gamma,
+    'Pareto (GPD)': GeneralizedPareto,
+    'Spliced Lognormal + GPD Tail': Spliced,
+}
+
+
+def make_frequency(loss_freq_params):
+    """Builds the frequency model named by ``loss_freq_params['model']`` from its mean and std."""
+    model = loss_freq_params.get('model', 'Poisson')
+    if model not in FREQUENCY_MODELS:
+        raise ValueError(f"Unknown frequency model {model!r}; expected one of {list(FREQUENCY_MODELS)}.")
+    return FREQUENCY_MODELS[model].from_moments(loss_freq_params.get('mean', 2), loss_freq_params.get('std', 1))
+
+
+def make_severity(loss_sev_params):
+    """Builds the severity model named by ``loss_sev_params['model']`` from its mean and std."""
+    model = loss_sev_params.get('model', 'Normal')
+    if model not in SEVERITY_MODELS:
+        raise ValueError(f"Unknown severity model {model!r}; expected one of {list(SEVERITY_MODELS)}.")
+    return SEVERITY_MODELS[model].from_moments(loss_sev_params.get('mean', 1000), loss_sev_params.get('std', 200))
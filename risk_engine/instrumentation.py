@@ -0,0 +1,193 @@
+"""Per-rerun timing of pipeline stages, with optional cProfile/tracemalloc dumps.
+
+Wrap a script run in ``record_run`` and each stage in ``stage`` (or decorate
+it with ``timed``)::
+
+    with record_run('Risk Profile & Monitoring') as run:
+        with stage('calculate_risk_profile') as record:
+            df = calculate_risk_profile(...)
+            record.rows = len(df)
+
+Stages record wall time, rows processed and, for ``memoize``-d functions,
+whether the compute cache hit and how long building the cache key took.
+Outside a ``record_run`` block ``stage`` only reads a context variable, so
+instrumented code costs next to nothing when nobody is recording.
+
+Set ``QULAB_PROFILE_DIR`` to also write a cProfile dump, a tracemalloc
+report and the stage timings for every run into that directory. Only one run
+is profiled at a time; a run that overlaps it (another session's rerun or the
+background warm-up) is timed but not profiled.
+
+``startup`` collects process-wide cold-start timings, such as the app's first
+script run and the background warm-up. This module
+only imports the standard library at load time so ``app.py`` can use it
+before any heavy dependency is loaded.
+"""
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_DIR_ENV = 'QULAB_PROFILE_DIR'
+
+# Cold-start timings of this process, e.g. ``first_run_seconds`` and ``warmup_seconds``
+startup = {}
+
+_current_run = contextvars.ContextVar('qulab_current_run', default=None)
+_current_stage = contextvars.ContextVar('qulab_current_stage', default=None)
+
+# cProfile and tracemalloc are process-wide, so profiled runs must not overlap
+_profile_lock = threading.Lock()
+
+
+class StageRecord:
+    """Timing of one stage; ``depth`` is its nesting level inside other stages."""
+
+    __slots__ = ('name', 'depth', 'seconds', 'rows', 'cache', 'key_seconds')
+
+    def __init__(self, name, depth=0, rows=None):
+        self.name = name
+        self.depth = depth
+        self.seconds = None
+        self.rows = rows
+        self.cache = None
+        self.key_seconds = None
+
+
+class RunRecord:
+    """Stages recorded during one script run, in the order they started."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started_at = datetime.now()
+        self.seconds = None
+        self.stages = []
+        self.profile_path = None
+        self.profile_note = None
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({
+            'Stage': ['  ' * record.depth + record.name for record in self.stages],
+            'Seconds': [record.seconds for record in self.stages],
+            'Rows': pd.array([record.rows for record in self.stages], dtype='Int64'),
+            'Cache': [record.cache or '' for record in self.stages],
+            'KeySeconds': [record.key_seconds for record in self.stages],
+        })
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Times the enclosed block as a stage of the current run; yields its ``StageRecord`` so callers can set ``rows``."""
+    run = _current_run.get()
+    if run is None:
+        yield StageRecord(name, rows=rows)
+        return
+    parent = _current_stage.get()
+    record = StageRecord(name, depth=0 if parent is None else parent.depth + 1, rows=rows)
+    run.stages.append(record)
+    token = _current_stage.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - started
+        _current_stage.reset(token)
+
+
+def timed(name=None, rows=None):
+    """Decorator form of ``stage``; ``rows`` is an optional function computing the row count from the arguments."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__) as record:
+                if rows is not None and _current_run.get() is not None:
+                    record.rows = rows(*args, **kwargs)
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def note_cache(hit, key_seconds):
+    """Records a compute cache lookup on the innermost active stage, if any."""
+    record = _current_stage.get()
+    if record is not None and record.cache is None:
+        record.cache = 'hit' if hit else 'miss'
+        record.key_seconds = key_seconds
+
+
+def _write_reports(run, profiler, memory_growth, directory):
+    """Writes the cProfile dump, a readable profile summary, the largest allocations made during the run and the stage timings."""
+    os.makedirs(directory, exist_ok=True)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', run.label).strip('-').lower() or 'run'
+    base = os.path.join(directory, f"{run.started_at:%Y%m%d-%H%M%S-%f}-{slug}")
+
+    profiler.dump_stats(f"{base}.prof")
+    with open(f"{base}-profile.txt", 'w') as f:
+        pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(40)
+    with open(f"{base}-memory.txt", 'w') as f:
+        for statistic in memory_growth[:40]:
+            f.write(f"{statistic}\n")
+    with open(f"{base}-stages.json", 'w') as f:
+        json.dump({
+            'label': run.label,
+            'started_at': run.started_at.isoformat(),
+            'seconds': run.seconds,
+            'stages': [
+                {slot: getattr(record, slot) for slot in StageRecord.__slots__}
+                for record in run.stages
+            ],
+        }, f, indent=2)
+    return f"{base}.prof"
+
+
+@contextmanager
+def record_run(label, profile_dir=None):
+    """Records every stage of one script run; profiles it too when ``profile_dir`` or ``$QULAB_PROFILE_DIR`` is set."""
+    run = RunRecord(label)
+    profile_dir = profile_dir or os.environ.get(PROFILE_DIR_ENV)
+    profiler = None
+    if profile_dir:
+        profiler = _start_profiling(run)
+        # Tracing is started once and left on; each run reports its growth against a starting snapshot
+        baseline = tracemalloc.take_snapshot() if profiler is not None else None
+    token = _current_run.set(run)
+    started = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.seconds = time.perf_counter() - started
+        _current_run.reset(token)
+        if profiler is not None:
+            try:
+                profiler.disable()
+                memory_growth = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+                run.profile_path = _write_reports(run, profiler, memory_growth, profile_dir)
+            finally:
+                _profile_lock.release()
+
+
+def _start_profiling(run):
+    """Takes the profiling lock and enables a profiler for ``run``; returns ``None`` with a note if another run holds it."""
+    if not _profile_lock.acquire(blocking=False):
+        run.profile_note = "Not profiled: another run was being profiled."
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12+ refuses a second active profiler, e.g. one started outside this module
+        _profile_lock.release()
+        run.profile_note = f"Not profiled: {e}."
+        return None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return profiler
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+class LossEvents:
+    """Loss events held as contiguous arrays grouped by day.
+
+    Each event is an ``int32`` day offset from ``start_date`` and a ``float64``
+    amount; events are sorted by day, and ``day_ptr`` holds CSR-style offsets
+    so day ``d``'s amounts are ``amounts[day_ptr[d]:day_ptr[d + 1]]``. Compared
+    with a DataFrame holding a timestamp per event this halves the per-event
+    date storage, and pandas objects are only built on demand by ``to_frame``.
+    """
+
+    def __init__(self, start_date, day_offsets, amounts, n_days):
+        day_offsets = np.asarray(day_offsets, dtype=np.int32)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if len(day_offsets) != len(amounts):
+            raise ValueError("day_offsets and amounts must have the same length.")
+        if len(day_offsets) and (day_offsets[0] < 0 or day_offsets[-1] >= n_days):
+            raise ValueError("day_offsets must lie in [0, n_days).")
+        if np.any(day_offsets[1:] < day_offsets[:-1]):
+            raise ValueError("day_offsets must be sorted; use LossEvents.from_day_offsets for unsorted events.")
+        self.start_date = np.datetime64(start_date, 'D')
+        self.n_days = int(n_days)
+        self.day_offsets = day_offsets
+        self.amounts = amounts
+        self.day_ptr = np.searchsorted(day_offsets, np.arange(self.n_days + 1, dtype=np.int32))
+
+    @classmethod
+    def from_counts(cls, start_date, counts, amounts):
+        """Builds the container from per-day event counts and the amounts of all events in day order."""
+        counts = np.asarray(counts)
+        day_offsets = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+        return cls(start_date, day_offsets, amounts, len(counts))
+
+    @classmethod
+    def from_day_offsets(cls, start_date, day_offsets, amounts, n_days):
+        """Builds the container from events in any order, keeping arrival order within each day."""
+        day_offsets = np.asarray(day_offsets)
+        order = np.argsort(day_offsets, kind='stable')
+        return cls(start_date, day_offsets[order], np.asarray(amounts)[order], n_days)
+
+    @classmethod
+    def from_frame(cls, df_loss_events, dates):
+        """Builds the container from a ``Date``/``LossAmount`` table over the daily ``dates``.
+
+        Events whose date is not in ``dates`` are dropped.
+        """
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        loss_dates = pd.to_datetime(df_loss_events['Date']).to_numpy(dtype='datetime64[ns]')
+        day_offsets = np.searchsorted(dates, loss_dates)
+        in_range = day_offsets < len(dates)
+        in_range[in_range] = dates[day_offsets[in_range]] == loss_dates[in_range]
+        start_date = dates[0] if len(dates) else np.datetime64('1970-01-01')
+        return cls.from_day_offsets(
+            start_date, day_offsets[in_range], df_loss_events['LossAmount'].to_numpy()[in_range], len(dates)
+        )
+
+    def __len__(self):
+        return len(self.amounts)
+
+    @property
+    def empty(self):
+        return len(self.amounts) == 0
+
+    @property
+    def nbytes(self):
+        return self.day_offsets.nbytes + self.amounts.nbytes + self.day_ptr.nbytes
+
+    def daily_counts(self):
+        return np.diff(self.day_ptr)
+
+    def daily_stats(self):
+        """Returns per-day loss sum, count and sum-of-squares rows, as ``profile.daily_loss_stats`` does."""
+        stats = np.empty((3, self.n_days), dtype=np.float64)
+        stats[0] = np.bincount(self.day_offsets, weights=self.amounts, minlength=self.n_days)
+        stats[1] = self.daily_counts()
+        stats[2] = np.bincount(self.day_offsets, weights=self.amounts * self.amounts, minlength=self.n_days)
+        return stats
+
+    def to_frame(self, start=0, stop=None):
+        """Returns events ``start:stop`` as a ``Date``/``LossAmount`` DataFrame.
+
+        ``LossAmount`` wraps the amounts array without copying; only the
+        ``Date`` column is materialized.
+        """
+        day_offsets = self.day_offsets[start:stop]
+        return pd.DataFrame({
+            'Date': (self.start_date + day_offsets.astype(np.int64) * ONE_DAY).astype('datetime64[ns]'),
+            'LossAmount': self.amounts[start:stop],
+        }, copy=False)
+
+    def head(self, n=5):
+        return self.to_frame(0, n)
@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from risk_engine.distributions import make_frequency, make_severity
+
+# Upper bound on severity draws held in memory at once by a single chunk
+DEFAULT_MAX_DRAWS_PER_CHUNK = 4_000_000
+
+# Expected severity draws an interactive run may make in total (a few seconds of sampling)
+MAX_INTERACTIVE_DRAWS = 100_000_000
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(n_workers):
+    """Returns the process-wide pool of ``n_workers`` workers, creating it on first use.
+
+    Workers are started with ``forkserver`` (``spawn`` where unavailable) rather
+    than ``fork``: the Streamlit server is multi-threaded, and forking it can
+    copy locks held by other threads into the children and deadlock them.
+    """
+    with _pools_lock:
+        pool = _pools.get(n_workers)
+        if pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context(method))
+            _pools[n_workers] = pool
+        return pool
+
+
+def _discard_pool(n_workers, pool):
+    with _pools_lock:
+        if _pools.get(n_workers) is pool:
+            del _pools[n_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _simulate_chunk(n_scenarios, frequency, severity, seed_seq):
+    """Simulates ``n_scenarios`` aggregate losses with one frequency and one severity draw."""
+    rng = np.random.default_rng(seed_seq)
+    counts = frequency.sample(n_scenarios, rng)
+    severities = severity.sample(int(counts.sum()), rng)
+    scenario_index = np.repeat(np.arange(n_scenarios), counts)
+    return np.bincount(scenario_index, weights=severities, minlength=n_scenarios)
+
+
+def _chunk_sizes(n_scenarios, freq_mean, max_draws_per_chunk):
+    """Splits the scenarios into chunks whose expected draw count stays under the bound."""
+    per_chunk = max(1, int(max_draws_per_chunk // max(freq_mean, 1.0)))
+    n_full, remainder = divmod(n_scenarios, per_chunk)
+    return [per_chunk] * n_full + ([remainder] if remainder else [])
+
+
+def expected_draws(n_scenarios, loss_freq_params, period_days=1):
+    """Returns the expected number of severity draws of a Monte Carlo run."""
+    return n_scenarios * loss_freq_params.get('mean', 2) * period_days
+
+
+def simulate_aggregate_losses(n_scenarios, loss_freq_params, loss_sev_params, period_days=1, seed=None,
+                              n_workers=1, max_draws_per_chunk=DEFAULT_MAX_DRAWS_PER_CHUNK, max_total_draws=None):
+    """Simulates aggregate losses over ``period_days`` for ``n_scenarios`` Monte Carlo scenarios.
+
+    Uses the page 1 frequency (per day) and severity parameters, including the
+    distribution chosen by their ``'model'`` keys.
+    Scenarios are generated in chunks of bounded size, each with its own
+    ``SeedSequence`` child stream, so results depend only on ``seed`` and not on
+    ``n_workers``. With ``n_workers > 1`` the chunks run on a shared process
+    pool (see ``get_process_pool``). With ``max_total_draws`` set, runs expected
+    to make more severity draws than that raise ValueError before sampling.
+    """
+    if n_scenarios <= 0:
+        raise ValueError("n_scenarios must be positive.")
+    if period_days <= 0:
+        raise ValueError("period_days must be positive.")
+    if max_total_draws is not None and expected_draws(n_scenarios, loss_freq_params, period_days) > max_total_draws:
+        raise ValueError(
+            f"{n_scenarios:,} scenarios of {period_days} days would draw about "
+            f"{expected_draws(n_scenarios, loss_freq_params, period_days):,.0f} losses, more than the "
+            f"{max_total_draws:,} allowed; reduce the scenarios, the aggregation period or the loss frequency."
+        )
+
+    frequency = make_frequency(loss_freq_params).scaled(period_days)
+    severity = make_severity(loss_sev_params)
+    freq_mean = expected_draws(1, loss_freq_params, period_days)
+
+    sizes = _chunk_sizes(n_scenarios, freq_mean, max_draws_per_chunk)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    n_workers = n_workers or os.cpu_count() or 1
+
+    if n_workers == 1 or len(sizes) == 1:
+        chunks = [_simulate_chunk(size, frequency, severity, seq) for size, seq in zip(sizes, child_seeds)]
+    else:
+        pool = get_process_pool(n_workers)
+        try:
+            chunks = list(pool.map(
+                _simulate_chunk, sizes, [frequency] * len(sizes), [severity] * len(sizes), child_seeds
+            ))
+        except BrokenProcessPool:
+            # A worker died; the next call starts a fresh pool
+            _discard_pool(n_workers, pool)
+            raise
+    return np.concatenate(chunks)
+
+
+def risk_measures(aggregate_losses, confidence_levels=(0.99,)):
+    """Computes Expected Loss, VaR and Expected Shortfall for each confidence level.
+
+    Unexpected Loss is reported as ``VaR - EL``.
+    """
+    aggregate_losses = np.asarray(aggregate_losses, dtype=np.float64)
+    if aggregate_losses.size == 0:
+        raise ValueError("aggregate_losses must not be empty.")
+
+    expected_loss = aggregate_losses.mean()
+    var = np.quantile(aggregate_losses, confidence_levels)
+    sorted_losses = np.sort(aggregate_losses)
+    # Tail means via a cumulative sum from the top so every level costs one lookup
+    tail_sums = np.cumsum(sorted_losses[::-1])[::-1]
+    tail_start = np.searchsorted(sorted_losses, var, side='left')
+    expected_shortfall = tail_sums[tail_start] / (sorted_losses.size - tail_start)
+
+    return pd.DataFrame({
+        'Confidence': list(confidence_levels),
+        'ExpectedLoss': expected_loss,
+        'VaR': var,
+        'ExpectedShortfall': expected_shortfall,
+        'UnexpectedLoss': var - expected_loss,
+    })
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from risk_engine.breaches import MISSING_LABEL, appetite_rules, evaluate_breaches, kri_rules
+from risk_engine.losses import LossEvents
+from risk_engine.profile import RollingRiskProfile
+from risk_engine.severe import SevereLossIndex
+
+
+def build_risk_profile(df_simulated_operations, loss_events, user_parameters, window_days=30, ewma_halflife=None,
+                       severe_loss_index=None):
+    """Adds rolling Expected Loss, Unexpected Loss, severe-loss counts and the KRI limit flag to a copy of the operations table.
+
+    ``loss_events`` is a ``LossEvents`` container over the same days as the
+    operations table; a ``Date``/``LossAmount`` DataFrame is converted first.
+
+    Severe losses (above ``user_parameters['SevereLoss_Threshold']``) are counted
+    over the trailing ``window_days`` days; pass a prebuilt ``severe_loss_index``
+    to avoid re-sorting the loss events for every threshold.
+    """
+    # Create a copy for the risk profile to avoid modifying original df_simulated_operations
+    df_risk_profile = df_simulated_operations.copy()
+    if isinstance(loss_events, pd.DataFrame):
+        loss_events = LossEvents.from_frame(loss_events, df_risk_profile['Date'])
+    elif loss_events.n_days != len(df_risk_profile):
+        raise ValueError("loss_events must cover the same days as df_simulated_operations.")
+
+    # Calculate Expected Loss (EL) and Unexpected Loss (UL)
+    # EL is the mean and UL the standard deviation of loss amounts within each day's rolling window
+    rolling_profile = RollingRiskProfile(window_days=window_days, ewma_halflife=ewma_halflife)
+    rolling_profile.extend(df_risk_profile['Date'], loss_events.daily_stats())
+    df_risk_profile['ExpectedLoss'] = rolling_profile.expected_loss
+    df_risk_profile['UnexpectedLoss'] = rolling_profile.unexpected_loss
+
+    # Count severe loss events in each day's rolling window
+    if 'SevereLoss_Threshold' in user_parameters:
+        if severe_loss_index is None:
+            severe_loss_index = SevereLossIndex.from_loss_events(loss_events)
+        df_risk_profile['SevereLossEvents'] = severe_loss_index.rolling_counts_above(
+            user_parameters['SevereLoss_Threshold'], window_days
+        )
+
+    # Incorporate KRI values (flag if KRI exceeds limit)
+    if 'KRI' in df_risk_profile.columns and 'KRI_Limit' in user_parameters:
+        df_risk_profile.loc[:, 'KRI_Exceeded'] = df_risk_profile['KRI'] > user_parameters['KRI_Limit']
+
+    return df_risk_profile
+
+
+def evaluate_risk_appetite(df_risk_profile, risk_appetite_params):
+    """Returns the ``(df_breaches, df_kri_status)`` status tables for a risk profile with a Date column."""
+    df_breaches = evaluate_breaches(df_risk_profile, appetite_rules(risk_appetite_params))
+    df_kri_status = evaluate_breaches(df_risk_profile, kri_rules(risk_appetite_params))
+    if 'KRI_Status' not in df_kri_status.columns:
+        # Handle cases where KRI or KRI_Limit might be missing
+        df_kri_status['KRI_Status'] = pd.Categorical([MISSING_LABEL] * len(df_kri_status))
+    return df_breaches, df_kri_status
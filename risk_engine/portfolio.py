@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from risk_engine.distributions import make_frequency, make_severity
+from risk_engine.profile import COUNT, SUM, SUMSQ, _moments
+from risk_engine.simulation import business_volume_curve
+
+
+class PortfolioPanel:
+    """Dense (business line x date) panel of simulated volumes, losses and KRIs.
+
+    Arrays are indexed ``[line, day]``; KRIs are ``[line, kri, day]``. Losses
+    are kept as per line-day sum, count and sum-of-squares rows
+    (``loss_stats[SUM | COUNT | SUMSQ]``), which is all the rolling EL/UL
+    measures need.
+    """
+
+    def __init__(self, dates, line_names, kri_names, business_volume, loss_stats, kri):
+        self.dates = dates
+        self.line_names = list(line_names)
+        self.kri_names = list(kri_names)
+        self.business_volume = business_volume
+        self.loss_stats = loss_stats
+        self.kri = kri
+
+    @property
+    def shape(self):
+        """``(n_lines, n_kris, n_days)``."""
+        return self.kri.shape
+
+    @property
+    def nbytes(self):
+        return self.business_volume.nbytes + self.loss_stats.nbytes + self.kri.nbytes
+
+    @property
+    def revenue(self):
+        return self.business_volume * 0.1
+
+    def rolling_risk(self, window_days=30):
+        """Returns ``(expected_loss, unexpected_loss)`` arrays of shape ``(n_lines, n_days)`` over a trailing window."""
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1.")
+        n_days = self.loss_stats.shape[-1]
+        cumulative = np.concatenate([np.zeros(self.loss_stats.shape[:-1] + (1,)), np.cumsum(self.loss_stats, axis=-1)], axis=-1)
+        upper = np.arange(1, n_days + 1)
+        lower = np.maximum(upper - window_days, 0)
+        return _moments(cumulative[..., upper] - cumulative[..., lower])
+
+
+def correlated_kris(n_lines, n_days, means, stds, correlation, rng):
+    """Draws KRI paths of shape ``(n_lines, n_kris, n_days)`` whose daily values are jointly normal.
+
+    ``means`` and ``stds`` broadcast to ``(n_lines, n_kris)``; ``correlation``
+    is the ``n_kris x n_kris`` correlation matrix shared by every line. The
+    covariance is Cholesky-factored once and applied to all lines and days
+    in a single matrix product.
+    """
+    correlation = np.atleast_2d(np.asarray(correlation, dtype=np.float64))
+    n_kris = correlation.shape[0]
+    if correlation.shape != (n_kris, n_kris) or not np.allclose(correlation, correlation.T):
+        raise ValueError("correlation must be a symmetric square matrix.")
+    try:
+        cholesky = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("correlation must be positive definite.")
+    means = np.broadcast_to(np.asarray(means, dtype=np.float64), (n_lines, n_kris))
+    stds = np.broadcast_to(np.asarray(stds, dtype=np.float64), (n_lines, n_kris))
+
+    shocks = rng.standard_normal((n_lines, n_days, n_kris)) @ cholesky.T
+    return means[:, :, None] + stds[:, :, None] * shocks.transpose(0, 2, 1)
+
+
+def equicorrelation(n_kris, rho):
+    """Returns the ``n_kris x n_kris`` correlation matrix with every off-diagonal entry equal to ``rho``."""
+    if n_kris > 1 and not -1.0 / (n_kris - 1) < rho < 1.0:
+        raise ValueError(f"rho must lie in ({-1.0 / (n_kris - 1):.3f}, 1) for {n_kris} KRIs.")
+    return np.full((n_kris, n_kris), rho) + (1.0 - rho) * np.eye(n_kris)
+
+
+def simulate_portfolio(start_date, end_date, lines, kri_params, rng=None):
+    """Simulates a portfolio of business lines over a shared daily calendar.
+
+    ``lines`` is a list of dicts with ``name``, ``growth_rate``,
+    ``loss_freq_params`` and ``loss_sev_params`` (as used by
+    ``simulate_operations``). ``kri_params`` has ``names``, ``means``,
+    ``stds`` (broadcastable to ``(n_lines, n_kris)``) and ``correlation``.
+    """
+    if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
+        raise TypeError("start_date and end_date must be datetime objects.")
+    if start_date > end_date:
+        raise ValueError("start_date must be before end_date.")
+    if not lines:
+        raise ValueError("At least one business line is required.")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    dates = pd.date_range(start_date, end_date)
+    n_lines, n_days = len(lines), len(dates)
+
+    # Business Volume: the same closed-form compounding as simulate_operations, broadcast over lines
+    business_volume = business_volume_curve([line.get('growth_rate', 0.01) for line in lines], n_days)
+
+    # Loss Events: one frequency and one severity draw per line, aggregated per line-day with a single bincount
+    counts = np.stack([make_frequency(line['loss_freq_params']).sample(n_days, rng) for line in lines])
+    amounts = np.concatenate([
+        make_severity(line['loss_sev_params']).sample(int(line_counts.sum()), rng)
+        for line, line_counts in zip(lines, counts)
+    ])
+    cell = np.repeat(np.arange(n_lines * n_days), counts.ravel())
+    loss_stats = np.empty((3, n_lines, n_days))
+    loss_stats[SUM] = np.bincount(cell, weights=amounts, minlength=n_lines * n_days).reshape(n_lines, n_days)
+    loss_stats[COUNT] = counts
+    loss_stats[SUMSQ] = np.bincount(cell, weights=amounts * amounts, minlength=n_lines * n_days).reshape(n_lines, n_days)
+
+    kri = correlated_kris(n_lines, n_days, kri_params['means'], kri_params['stds'], kri_params['correlation'], rng)
+
+    return PortfolioPanel(
+        dates.values, [line['name'] for line in lines], kri_params['names'],
+        business_volume, loss_stats, kri
+    )
+
+
+def evaluate_portfolio_breaches(panel, limits, window_days=30):
+    """Flags every appetite breach in the panel in one broadcast comparison per measure.
+
+    ``limits`` holds per-line ``MaxExpectedLoss_Threshold`` and
+    ``MaxUnexpectedLoss_Threshold`` (shape ``(n_lines,)``) and ``KRI_Limit``
+    (broadcastable to ``(n_lines, n_kris)``). Returns boolean arrays
+    ``ExpectedLoss`` and ``UnexpectedLoss`` of shape ``(n_lines, n_days)`` and
+    ``KRI`` of shape ``(n_lines, n_kris, n_days)``.
+    """
+    n_lines, n_kris, _ = panel.shape
+    expected_loss, unexpected_loss = panel.rolling_risk(window_days)
+    max_el = np.broadcast_to(np.asarray(limits['MaxExpectedLoss_Threshold'], dtype=np.float64), (n_lines,))
+    max_ul = np.broadcast_to(np.asarray(limits['MaxUnexpectedLoss_Threshold'], dtype=np.float64), (n_lines,))
+    kri_limit = np.broadcast_to(np.asarray(limits['KRI_Limit'], dtype=np.float64), (n_lines, n_kris))
+    return {
+        'ExpectedLoss': expected_loss > max_el[:, None],
+        'UnexpectedLoss': unexpected_loss > max_ul[:, None],
+        'KRI': panel.kri > kri_limit[:, :, None],
+    }
+
+
+def breach_summary(panel, breaches):
+    """Summarises breach arrays as one row per business line and measure (each KRI is its own measure)."""
+    n_lines, n_kris, n_days = panel.shape
+    # Stack every measure into one (n_lines, n_measures, n_days) array so the reductions run once
+    stacked = np.concatenate([breaches['ExpectedLoss'][:, None], breaches['UnexpectedLoss'][:, None], breaches['KRI']], axis=1)
+    measures = ['ExpectedLoss', 'UnexpectedLoss'] + [f"KRI: {name}" for name in panel.kri_names]
+    breach_days = stacked.sum(axis=-1)
+    # Index of the last breached day, or -1 when a measure never breached
+    last_breach = np.where(breach_days > 0, n_days - 1 - np.argmax(stacked[..., ::-1], axis=-1), -1)
+    return pd.DataFrame({
+        'BusinessLine': np.repeat(panel.line_names, len(measures)),
+        'Measure': np.tile(measures, n_lines),
+        'BreachDays': breach_days.ravel(),
+        'BreachRate': breach_days.ravel() / max(n_days, 1),
+        'LastBreach': pd.to_datetime(np.where(last_breach.ravel() >= 0, panel.dates[np.maximum(last_breach.ravel(), 0)], np.datetime64('NaT'))),
+    })
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# Rows of the per-day statistics array: loss sum, loss count and loss sum-of-squares
+SUM, COUNT, SUMSQ = 0, 1, 2
+
+# Longest closed-form EWMA block, and the most growth its decay ** -block may reach (2 ** 64) so the
+# rescaled sums stay well inside float range; short half-lives use shorter blocks
+_EWMA_BLOCK = 256
+_EWMA_MAX_LOG_GROWTH = 64 * np.log(2.0)
+
+# Shortest EWMA half-life in days. Shorter ones give earlier days so little weight that UL on a
+# single-loss day divides by almost zero and is rounding noise
+MIN_EWMA_HALFLIFE = 0.25
+
+
+def daily_loss_stats(dates, loss_dates, loss_amounts):
+    """Aggregates loss events into per-day sum, count and sum-of-squares rows aligned with ``dates``.
+
+    Events whose date is not in ``dates`` are ignored.
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    loss_dates = np.asarray(loss_dates, dtype='datetime64[ns]')
+    loss_amounts = np.asarray(loss_amounts, dtype=np.float64)
+
+    day_index = np.searchsorted(dates, loss_dates)
+    in_range = day_index < len(dates)
+    in_range[in_range] = dates[day_index[in_range]] == loss_dates[in_range]
+    day_index = day_index[in_range]
+    amounts = loss_amounts[in_range]
+
+    stats = np.empty((3, len(dates)), dtype=np.float64)
+    stats[SUM] = np.bincount(day_index, weights=amounts, minlength=len(dates))
+    stats[COUNT] = np.bincount(day_index, minlength=len(dates))
+    stats[SUMSQ] = np.bincount(day_index, weights=amounts * amounts, minlength=len(dates))
+    return stats
+
+
+def _ewma_sums(stats, decay, initial):
+    """Computes ``s[t] = decay * s[t-1] + x[t]`` along the last axis in closed-form blocks."""
+    out = np.empty_like(stats)
+    state = np.asarray(initial, dtype=np.float64)
+    block_days = int(min(_EWMA_BLOCK, max(1, _EWMA_MAX_LOG_GROWTH // -np.log(decay))))
+    for start in range(0, stats.shape[1], block_days):
+        block = stats[:, start:start + block_days]
+        powers = decay ** np.arange(1, block.shape[1] + 1)
+        out_block = powers * (state[:, None] + np.cumsum(block / powers, axis=1))
+        out[:, start:start + block.shape[1]] = out_block
+        state = out_block[:, -1]
+    return out
+
+
+def _moments(window_stats):
+    """Turns windowed sum/count/sum-of-squares rows into EL (mean) and UL (sample std) of loss amounts."""
+    total, count, sumsq = window_stats
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected_loss = np.where(count > 0, total / count, 0.0)
+        variance = (sumsq - count * expected_loss ** 2) / (count - 1)
+    unexpected_loss = np.where(count > 1, np.sqrt(np.clip(variance, 0.0, None)), 0.0)
+    return expected_loss, unexpected_loss
+
+
+class RollingRiskProfile:
+    """Time-varying Expected and Unexpected Loss over a rolling window of days.
+
+    With ``ewma_halflife`` set, EL and UL are exponentially weighted (half-life in
+    days) instead of using a hard ``window_days`` window. ``update`` appends new
+    days and losses and recomputes only the affected tail, which makes the
+    profile suitable for a live daily loss feed.
+    """
+
+    def __init__(self, window_days=30, ewma_halflife=None):
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1.")
+        if ewma_halflife is not None and not ewma_halflife >= MIN_EWMA_HALFLIFE:
+            raise ValueError(f"ewma_halflife must be at least {MIN_EWMA_HALFLIFE:g} days.")
+        self.window_days = int(window_days)
+        self.ewma_halflife = ewma_halflife
+        self._dates = np.empty(0, dtype='datetime64[ns]')
+        self._stats = np.empty((3, 0))
+        self._window_stats = np.empty((3, 0))
+        self._cumulative = np.zeros((3, 1))
+        self.expected_loss = np.empty(0)
+        self.unexpected_loss = np.empty(0)
+
+    def __len__(self):
+        return len(self._dates)
+
+    def update(self, new_dates, loss_dates, loss_amounts):
+        """Appends ``new_dates`` and adds loss events, returning the recomputed tail of the profile.
+
+        ``new_dates`` must be later than any date already in the profile. Loss
+        events may fall on new or existing days; recomputation starts at the
+        earliest day touched.
+        """
+        new_dates = np.asarray(new_dates, dtype='datetime64[ns]')
+        if len(new_dates) and len(self._dates) and new_dates[0] <= self._dates[-1]:
+            raise ValueError("new_dates must be later than the dates already in the profile.")
+        first_new_day = len(self._dates)
+
+        self._dates = np.concatenate([self._dates, new_dates])
+        self._stats = np.concatenate([self._stats, np.zeros((3, len(new_dates)))], axis=1)
+        loss_dates = np.asarray(loss_dates, dtype='datetime64[ns]')
+        start = first_new_day
+        if len(loss_dates):
+            start = min(start, int(np.searchsorted(self._dates, loss_dates.min())))
+        self._stats[:, start:] += daily_loss_stats(self._dates[start:], loss_dates, loss_amounts)
+        self._recompute_from(start)
+        return self.to_frame(start)
+
+    def extend(self, new_dates, new_stats):
+        """Appends ``new_dates`` with their precomputed per-day stats rows, returning the new tail of the profile.
+
+        ``new_stats`` is a ``(3, len(new_dates))`` array as returned by
+        ``daily_loss_stats`` or ``LossEvents.daily_stats``.
+        """
+        new_dates = np.asarray(new_dates, dtype='datetime64[ns]')
+        new_stats = np.asarray(new_stats, dtype=np.float64)
+        if new_stats.shape != (3, len(new_dates)):
+            raise ValueError("new_stats must have shape (3, len(new_dates)).")
+        if len(new_dates) and len(self._dates) and new_dates[0] <= self._dates[-1]:
+            raise ValueError("new_dates must be later than the dates already in the profile.")
+        start = len(self._dates)
+        self._dates = np.concatenate([self._dates, new_dates])
+        self._stats = np.concatenate([self._stats, new_stats], axis=1)
+        self._recompute_from(start)
+        return self.to_frame(start)
+
+    def _recompute_from(self, start):
+        """Recomputes windowed statistics and EL/UL from day ``start`` onwards."""
+        n_days = len(self._dates)
+        if self.ewma_halflife is None:
+            tail_cumulative = self._cumulative[:, start:start + 1] + np.cumsum(self._stats[:, start:], axis=1)
+            self._cumulative = np.concatenate([self._cumulative[:, :start + 1], tail_cumulative], axis=1)
+            upper = np.arange(start, n_days) + 1
+            lower = np.maximum(upper - self.window_days, 0)
+            tail_window = self._cumulative[:, upper] - self._cumulative[:, lower]
+        else:
+            decay = 0.5 ** (1.0 / self.ewma_halflife)
+            initial = self._window_stats[:, start - 1] if start > 0 else np.zeros(3)
+            tail_window = _ewma_sums(self._stats[:, start:], decay, initial)
+        self._window_stats = np.concatenate([self._window_stats[:, :start], tail_window], axis=1)
+
+        expected_loss, unexpected_loss = _moments(tail_window)
+        self.expected_loss = np.concatenate([self.expected_loss[:start], expected_loss])
+        self.unexpected_loss = np.concatenate([self.unexpected_loss[:start], unexpected_loss])
+
+    def to_frame(self, start=0):
+        """Returns the profile from day ``start`` onwards as a DataFrame."""
+        return pd.DataFrame({
+            'Date': self._dates[start:],
+            'ExpectedLoss': self.expected_loss[start:],
+            'UnexpectedLoss': self.unexpected_loss[start:],
+        })
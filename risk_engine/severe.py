@@ -0,0 +1,59 @@
+import numpy as np
+
+
+class SevereLossIndex:
+    """Index over loss events answering "how many losses above X" per day by binary search.
+
+    Events are sorted by ``(day, amount)``, so each day's amounts form a sorted
+    segment. Every event is encoded as ``day * n_events + global_amount_position``; a
+    threshold maps to a single rank, and one ``searchsorted`` over the encoded
+    keys then locates the threshold inside every day's segment at once. Building
+    the index costs one sort; each threshold query is ``O(n_days log n_events)``
+    regardless of how many events fall in each day.
+    """
+
+    def __init__(self, day_offsets, loss_amounts, n_days):
+        day_offsets = np.asarray(day_offsets, dtype=np.int64)
+        loss_amounts = np.asarray(loss_amounts, dtype=np.float64)
+        if len(day_offsets) != len(loss_amounts):
+            raise ValueError("day_offsets and loss_amounts must have the same length.")
+        if len(day_offsets) and (day_offsets.min() < 0 or day_offsets.max() >= n_days):
+            raise ValueError("day_offsets must lie in [0, n_days).")
+
+        self.n_days = int(n_days)
+        self.n_events = len(loss_amounts)
+        order = np.argsort(loss_amounts, kind='stable')
+        self.sorted_amounts = loss_amounts[order]
+        # Position of each event in the global amount order; a threshold's rank separates
+        # amounts <= threshold (lower positions) from amounts above it, ties included
+        ranks = np.empty(self.n_events, dtype=np.int64)
+        ranks[order] = np.arange(self.n_events)
+        self._keys = np.sort(day_offsets * max(self.n_events, 1) + ranks)
+        # Per-day segment starts (CSR-style offsets) into the sorted keys
+        self.day_starts = np.searchsorted(self._keys, np.arange(self.n_days + 1) * max(self.n_events, 1))
+
+    @property
+    def nbytes(self):
+        return self.sorted_amounts.nbytes + self._keys.nbytes + self.day_starts.nbytes
+
+    @classmethod
+    def from_loss_events(cls, loss_events):
+        """Builds the index for a ``LossEvents`` container, whose day offsets are already in place."""
+        return cls(loss_events.day_offsets, loss_events.amounts, loss_events.n_days)
+
+    def daily_counts_above(self, threshold):
+        """Returns the number of losses strictly above ``threshold`` on each day."""
+        rank = np.searchsorted(self.sorted_amounts, threshold, side='right')
+        stride = max(self.n_events, 1)
+        below = np.searchsorted(self._keys, np.arange(self.n_days) * stride + rank, side='left')
+        return self.day_starts[1:] - below
+
+    def cumulative_counts_above(self, threshold):
+        """Returns cumulative counts of losses above ``threshold``, with a leading zero (length ``n_days + 1``)."""
+        return np.concatenate([[0], np.cumsum(self.daily_counts_above(threshold))])
+
+    def rolling_counts_above(self, threshold, window_days):
+        """Returns, for each day, the number of losses above ``threshold`` in the trailing ``window_days`` days."""
+        cumulative = self.cumulative_counts_above(threshold)
+        upper = np.arange(1, self.n_days + 1)
+        return cumulative[upper] - cumulative[np.maximum(upper - window_days, 0)]
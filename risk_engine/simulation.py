@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from risk_engine.distributions import make_frequency, make_severity
+from risk_engine.losses import LossEvents
+
+
+def business_volume_curve(growth_rates, n_days):
+    """Compounds a volume of 100 by ``(1 + growth_rate)`` each day, in whole units, in closed form.
+
+    ``growth_rates`` is a scalar or an array of per-line rates; the result has
+    shape ``np.shape(growth_rates) + (n_days,)``. It is kept as float: over long
+    horizons the volume outgrows int64 (and wrapped to INT64_MIN when cast).
+    Raises ValueError when a rate overflows float64 within ``n_days``.
+    """
+    growth_rates = np.asarray(growth_rates, dtype=np.float64)
+    with np.errstate(over='ignore'):
+        business_volume = np.floor(100.0 * np.power(1.0 + growth_rates[..., None], np.arange(n_days, dtype=np.float64)))
+    overflowed = ~np.isfinite(business_volume).all(axis=-1)
+    if overflowed.any():
+        raise ValueError(f"A growth rate of {growth_rates[overflowed][0]} compounded daily overflows business volume over {n_days} days.")
+    return business_volume
+
+
+def simulate_operations(start_date, end_date, business_params, loss_freq_params, loss_sev_params, kpi_params, rng=None):
+    """Simulates daily business operations and loss events with batched NumPy draws.
+
+    Returns ``(df_simulated_operations, loss_events)``: the daily operations
+    table and a ``risk_engine.losses.LossEvents`` container of the loss
+    events. The ``'model'`` keys of the frequency and severity parameters
+    select entries of ``risk_engine.distributions``. ``rng`` is a
+    ``numpy.random.Generator``; pass a seeded one (e.g.
+    ``np.random.default_rng(42)``) for reproducible runs.
+    """
+    if not isinstance(start_date, datetime) or not isinstance(end_date, datetime):
+        raise TypeError("start_date and end_date must be datetime objects.")
+    if start_date > end_date:
+        raise ValueError("start_date must be before end_date.")
+    if rng is None:
+        rng = np.random.default_rng()
+    elif not isinstance(rng, np.random.Generator):
+        raise TypeError("rng must be a numpy.random.Generator.")
+
+    dates = pd.date_range(start_date, end_date)
+    n_days = len(dates)
+    df_simulated_operations = pd.DataFrame({'Date': dates})
+
+    # Business Volume
+    df_simulated_operations['BusinessVolume'] = business_volume_curve(business_params.get('growth_rate', 0.01), n_days)
+
+    # Revenue
+    df_simulated_operations['Revenue'] = df_simulated_operations['BusinessVolume'] * 0.1
+
+    # Loss Events: one frequency draw for all days, one severity draw for all events
+    counts = make_frequency(loss_freq_params).sample(n_days, rng)
+    loss_amounts = make_severity(loss_sev_params).sample(int(counts.sum()), rng)
+    loss_events = LossEvents.from_counts(start_date, counts, loss_amounts)
+
+    # Key Risk Indicator
+    baseline = kpi_params.get('baseline', 50)
+    volatility = kpi_params.get('volatility', 5)
+    df_simulated_operations['KRI'] = rng.normal(baseline, volatility, n_days)
+
+    return df_simulated_operations, loss_events
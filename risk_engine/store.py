@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.ipc
+
+from risk_engine.cache import tag_fingerprint
+from risk_engine.losses import LossEvents
+
+ScenarioHandle = namedtuple('ScenarioHandle', ['key', 'path'])
+ScenarioHandle.__doc__ = """Lightweight reference to a persisted scenario, cheap to keep in ``st.session_state``."""
+
+SCENARIO_DIR_ENV = 'QULAB_SCENARIO_DIR'
+SCENARIO_MAX_BYTES_ENV = 'QULAB_SCENARIO_MAX_BYTES'
+SCENARIO_MAX_AGE_ENV = 'QULAB_SCENARIO_MAX_AGE_SECONDS'
+DEFAULT_SCENARIO_DIR = '.scenario_store'
+DEFAULT_SCENARIO_MAX_BYTES = 2 * 1024 ** 3
+
+# Staging directories this old were left by a writer that died mid-save
+STALE_STAGING_SECONDS = 3600
+
+OPS_FILE = 'operations.arrow'
+LOSSES_FILE = 'losses.arrow'
+PARAMS_FILE = 'params.json'
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__} in scenario parameters.")
+
+
+def scenario_key(*params):
+    """Derives a stable scenario key from the parameters passed to ``generate_synthetic_data``."""
+    canonical = json.dumps(params, sort_keys=True, default=_json_default, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def _write_table(table, path):
+    """Writes ``table`` as an uncompressed Arrow IPC file, which can be memory-mapped on reload."""
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_table(path):
+    """Memory-maps an Arrow IPC file; column buffers point into the map."""
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _loss_events_table(loss_events):
+    """Lays out ``LossEvents`` as ``DayOffset``/``LossAmount`` columns, with the day range in the schema metadata."""
+    return pa.table(
+        {'DayOffset': loss_events.day_offsets, 'LossAmount': loss_events.amounts},
+        metadata={'start_date': str(loss_events.start_date), 'n_days': str(loss_events.n_days)}
+    )
+
+
+def _loss_events_from_table(table):
+    metadata = table.schema.metadata
+    # Single-chunk numeric columns convert to NumPy views over the memory map
+    return LossEvents(
+        metadata[b'start_date'].decode(),
+        table.column('DayOffset').to_numpy(),
+        table.column('LossAmount').to_numpy(),
+        int(metadata[b'n_days'])
+    )
+
+
+def _directory_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class ScenarioStore:
+    """On-disk store of generated scenarios, one directory of Arrow files per scenario key.
+
+    Scenarios are written once and reloaded through memory maps, so every
+    session exploring the same parameters shares one copy in the OS page cache.
+    After each new scenario is saved, the least recently used ones are removed
+    until the store fits in ``max_bytes``, along with any unused for longer than
+    ``max_age_seconds``.
+    """
+
+    def __init__(self, root=None, max_bytes=None, max_age_seconds=None):
+        self.root = root or os.environ.get(SCENARIO_DIR_ENV, DEFAULT_SCENARIO_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.environ.get(SCENARIO_MAX_BYTES_ENV, DEFAULT_SCENARIO_MAX_BYTES))
+        if max_age_seconds is None and os.environ.get(SCENARIO_MAX_AGE_ENV):
+            max_age_seconds = float(os.environ[SCENARIO_MAX_AGE_ENV])
+        self.max_age_seconds = max_age_seconds
+
+    def handle(self, key):
+        return ScenarioHandle(key, os.path.join(self.root, key))
+
+    def contains(self, handle):
+        return os.path.exists(os.path.join(handle.path, PARAMS_FILE))
+
+    def save(self, key, df_simulated_operations, loss_events, params=None):
+        """Persists a scenario and returns its handle; concurrent writers of the same key are safe."""
+        handle = self.handle(key)
+        staging = f"{handle.path}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(staging)
+        _write_table(pa.Table.from_pandas(df_simulated_operations, preserve_index=False), os.path.join(staging, OPS_FILE))
+        _write_table(_loss_events_table(loss_events), os.path.join(staging, LOSSES_FILE))
+        # The params file is written last and marks the scenario as complete
+        with open(os.path.join(staging, PARAMS_FILE), 'w') as f:
+            json.dump(params, f, default=_json_default)
+        try:
+            os.rename(staging, handle.path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            # Only a scenario another process stored first is an acceptable reason
+            if not self.contains(handle):
+                raise
+        return handle
+
+    def load(self, handle):
+        """Reloads ``(df_simulated_operations, loss_events)`` for a stored scenario via memory maps."""
+        if not self.contains(handle):
+            raise KeyError(f"Scenario {handle.key} is not in the store at {self.root}.")
+        self._touch(handle)
+        df_simulated_operations = _read_table(os.path.join(handle.path, OPS_FILE)).to_pandas(split_blocks=True)
+        loss_events = _loss_events_from_table(_read_table(os.path.join(handle.path, LOSSES_FILE)))
+        # Tag both so the compute cache can key on the scenario instead of rehashing them
+        tag_fingerprint(df_simulated_operations, f"{handle.key}:operations")
+        tag_fingerprint(loss_events, f"{handle.key}:losses")
+        return df_simulated_operations, loss_events
+
+    def get_or_create(self, key, generate, params=None):
+        """Returns the handle for ``key``, calling ``generate()`` to build the scenario only if it is missing."""
+        handle = self.handle(key)
+        if not self.contains(handle):
+            df_simulated_operations, loss_events = generate()
+            handle = self.save(key, df_simulated_operations, loss_events, params)
+            self.prune(keep=handle.key)
+        return handle
+
+    def _touch(self, handle):
+        """Marks a scenario as used; the params file's mtime is its last-use time."""
+        try:
+            os.utime(os.path.join(handle.path, PARAMS_FILE))
+        except OSError:
+            pass
+
+    def prune(self, keep=None):
+        """Removes scenarios unused for over ``max_age_seconds``, then the least recently used until under ``max_bytes``.
+
+        The scenario ``keep`` is never removed. Returns the number of scenarios removed.
+        """
+        if not os.path.isdir(self.root):
+            return 0
+        now = time.time()
+        scenarios = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir():
+                continue
+            if entry.name.endswith('.tmp'):
+                if now - entry.stat().st_mtime > STALE_STAGING_SECONDS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            try:
+                last_used = os.stat(os.path.join(entry.path, PARAMS_FILE)).st_mtime
+                scenarios.append((last_used, entry.name, _directory_bytes(entry.path)))
+            except OSError:
+                # Removed by another process while scanning
+                continue
+
+        scenarios.sort()
+        total_bytes = sum(nbytes for _, _, nbytes in scenarios)
+        removed = 0
+        for last_used, key, nbytes in scenarios:
+            expired = self.max_age_seconds is not None and now - last_used > self.max_age_seconds
+            if key == keep or not (expired or total_bytes > self.max_bytes):
+                continue
+            # Open memory maps of a removed scenario stay valid until they are released
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total_bytes -= nbytes
+            removed += 1
+        return removed
+
+
+_default_store = None
+
+
+def get_default_store():
+    """Returns the process-wide store rooted at ``$QULAB_SCENARIO_DIR`` (default ``.scenario_store``), bounded by ``$QULAB_SCENARIO_MAX_*``."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ScenarioStore()
+    return _default_store
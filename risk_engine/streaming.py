@@ -0,0 +1,322 @@
+"""Live ingestion of operational loss events and KRI readings.
+
+Records arrive one per line, as newline-delimited JSON::
+
+    {"type": "loss", "date": "2024-03-01", "amount": 1830.5}
+    {"type": "kri", "date": "2024-03-01", "value": 57.2}
+
+or as CSV with the columns ``type,date,value``. An asyncio consumer reads
+lines from a tailed file or a local TCP socket, groups them into micro-batches
+and feeds them to a ``LiveRiskMonitor``, which appends them to array-backed
+buffers and recomputes only the affected tail of the risk profile and breach
+status. Malformed lines are counted and skipped rather than ending the feed.
+"""
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from risk_engine.losses import ONE_DAY
+from risk_engine.pipeline import evaluate_risk_appetite
+from risk_engine.profile import RollingRiskProfile
+
+LiveDelta = namedtuple('LiveDelta', ['profile', 'breaches', 'kri_status'])
+LiveDelta.__doc__ = """Rows of the risk profile and status tables that changed in one micro-batch."""
+
+RECORD_TYPES = ('loss', 'kri')
+
+# A feed nobody has drained for this long belongs to a closed session and stops itself
+DEFAULT_IDLE_TIMEOUT = 120.0
+
+
+class GrowableBuffer:
+    """Preallocated 1-D NumPy buffer that doubles its capacity when full."""
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        required = self._size + len(values)
+        if required > len(self._data):
+            grown = np.empty(max(required, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:required] = values
+        self._size = required
+
+    def view(self):
+        """Returns the filled part of the buffer without copying."""
+        return self._data[:self._size]
+
+
+def parse_line(line):
+    """Parses one NDJSON or CSV record into ``(type, date, value)``; returns ``None`` for blank or header lines.
+
+    Raises ``ValueError`` for malformed records, unknown types, unparseable dates and non-finite values.
+    """
+    line = line.strip()
+    if not line or line.lower().startswith('type,'):
+        return None
+    try:
+        if line.startswith('{'):
+            record = json.loads(line)
+            record_type = record['type']
+            value = record['amount'] if record_type == 'loss' else record['value']
+            date = record['date']
+        else:
+            record_type, date, value = line.split(',')[:3]
+            record_type, date = record_type.strip(), date.strip()
+        date = np.datetime64(date, 'D')
+        value = float(value)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Malformed record {line!r}: {e}") from e
+    if record_type not in RECORD_TYPES:
+        raise ValueError(f"Unknown record type {record_type!r}.")
+    if np.isnat(date) or not np.isfinite(value):
+        raise ValueError(f"Record {line!r} has a missing date or a non-finite value.")
+    return record_type, date, value
+
+
+class LiveRiskMonitor:
+    """Incrementally maintained risk profile and appetite status for a live loss and KRI feed."""
+
+    def __init__(self, risk_appetite_params, window_days=30, ewma_halflife=None):
+        self.risk_appetite_params = risk_appetite_params
+        self.profile = RollingRiskProfile(window_days=window_days, ewma_halflife=ewma_halflife)
+        self.first_date = None
+        self.loss_days = GrowableBuffer(np.int32)
+        self.loss_amounts = GrowableBuffer(np.float64)
+        self.kri = GrowableBuffer(np.float64)
+        self.severe_counts = GrowableBuffer(np.int64)
+        self.dropped = 0
+        self.rejected = 0
+
+    def ingest(self, records):
+        """Applies a micro-batch of parsed records and returns the changed rows as a ``LiveDelta``."""
+        if not records:
+            return None
+        types = np.array([record[0] for record in records])
+        dates = np.array([record[1] for record in records], dtype='datetime64[D]')
+        values = np.array([record[2] for record in records], dtype=np.float64)
+
+        if self.first_date is None:
+            self.first_date = dates.min()
+        day_offsets = (dates - self.first_date) // ONE_DAY
+        # Records dated before the start of the feed cannot be placed on the profile
+        valid = day_offsets >= 0
+        self.dropped += int((~valid).sum())
+        is_loss = valid & (types == 'loss')
+        is_kri = valid & (types == 'kri')
+
+        n_days_before = len(self.profile)
+        n_days_after = max(n_days_before, int(day_offsets[valid].max()) + 1) if valid.any() else n_days_before
+        new_dates = self.first_date + np.arange(n_days_before, n_days_after) * ONE_DAY
+
+        # KRI readings are kept one per day; the latest reading in the batch wins
+        self.kri.extend(np.full(n_days_after - n_days_before, np.nan))
+        self.severe_counts.extend(np.zeros(n_days_after - n_days_before))
+        kri_days = day_offsets[is_kri]
+        self.kri.view()[kri_days] = values[is_kri]
+
+        loss_days = day_offsets[is_loss]
+        self.loss_days.extend(loss_days)
+        self.loss_amounts.extend(values[is_loss])
+        loss_dates = self.first_date + loss_days * ONE_DAY
+        df_profile = self.profile.update(new_dates, loss_dates, values[is_loss])
+        if 'SevereLoss_Threshold' in self.risk_appetite_params:
+            is_severe = values[is_loss] > self.risk_appetite_params['SevereLoss_Threshold']
+            np.add.at(self.severe_counts.view(), loss_days[is_severe], 1)
+
+        # Recompute status from the earliest day touched by either the losses or the KRI readings
+        start = len(self.profile) - len(df_profile)
+        if len(kri_days):
+            start = min(start, int(kri_days.min()))
+        df_profile = self.profile.to_frame(start)
+        if 'SevereLoss_Threshold' in self.risk_appetite_params:
+            df_profile['SevereLossEvents'] = self._rolling_severe_counts(start)
+        df_profile['KRI'] = self.kri.view()[start:]
+        df_breaches, df_kri_status = evaluate_risk_appetite(df_profile, self.risk_appetite_params)
+        return LiveDelta(df_profile, df_breaches, df_kri_status)
+
+    def _rolling_severe_counts(self, start):
+        """Returns trailing-window severe loss counts from day ``start`` onwards."""
+        window_days = self.profile.window_days
+        lower = max(start - window_days + 1, 0)
+        cumulative = np.concatenate([[0], np.cumsum(self.severe_counts.view()[lower:])])
+        upper = np.arange(start, len(self.severe_counts)) + 1 - lower
+        return cumulative[upper] - cumulative[np.maximum(upper - window_days, 0)]
+
+
+async def tail_file(path, poll_interval=0.5, from_start=True):
+    """Yields lines appended to ``path``, like ``tail -f``; waits for the file if it does not exist yet."""
+    while not os.path.exists(path):
+        await asyncio.sleep(poll_interval)
+    with open(path) as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ''
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            partial += chunk
+            if partial.endswith('\n'):
+                yield partial
+                partial = ''
+
+
+async def read_socket(host, port):
+    """Yields lines sent by a producer listening on a local TCP socket."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield line.decode('utf-8')
+    finally:
+        writer.close()
+
+
+async def consume(lines, monitor, on_delta, batch_size=500, max_latency=0.5):
+    """Reads ``lines`` into micro-batches of up to ``batch_size`` records or ``max_latency`` seconds.
+
+    Each batch is passed to ``monitor.ingest`` and the resulting delta to ``on_delta``.
+    Lines ``parse_line`` rejects are counted in ``monitor.rejected`` and skipped.
+    """
+    iterator = lines.__aiter__()
+    batch = []
+    pending = None
+    loop = asyncio.get_running_loop()
+    deadline = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                try:
+                    line = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+                try:
+                    record = parse_line(line)
+                except ValueError:
+                    monitor.rejected += 1
+                    record = None
+                if record is not None:
+                    batch.append(record)
+                    if deadline is None:
+                        deadline = loop.time() + max_latency
+            if batch and (len(batch) >= batch_size or loop.time() >= deadline):
+                on_delta(monitor.ingest(batch))
+                batch = []
+                deadline = None
+    finally:
+        # Cancelling the read in flight also closes the line source
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+    if batch:
+        on_delta(monitor.ingest(batch))
+
+
+class LiveFeed:
+    """Runs ``consume`` on a background event loop and hands deltas to the Streamlit thread.
+
+    ``source`` is a file path to tail or ``'host:port'`` of a local socket.
+    Streamlit has no session-end hook, so the feed stops itself once
+    ``drain`` has not been called for ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, source, risk_appetite_params, window_days=30, ewma_halflife=None, batch_size=500, max_latency=0.5,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.source = source
+        self.monitor = LiveRiskMonitor(risk_appetite_params, window_days=window_days, ewma_halflife=ewma_halflife)
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.idle_timeout = idle_timeout
+        self.error = None
+        self._deltas = queue.Queue()
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._last_drain = time.monotonic()
+
+    def _lines(self):
+        host, _, port = self.source.rpartition(':')
+        if host and port.isdigit() and not os.path.exists(self.source):
+            return read_socket(host, int(port))
+        return tail_file(self.source)
+
+    async def _run(self):
+        consumer = asyncio.ensure_future(consume(self._lines(), self.monitor, self._deltas.put, self.batch_size, self.max_latency))
+        try:
+            while True:
+                done, _ = await asyncio.wait({consumer}, timeout=min(self.idle_timeout, 5.0) if self.idle_timeout else None)
+                if done:
+                    consumer.result()
+                    return
+                if time.monotonic() - self._last_drain > self.idle_timeout:
+                    self.error = TimeoutError(f"not read for {self.idle_timeout:g}s, the session viewing it has likely closed.")
+                    return
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    def _serve(self):
+        try:
+            self._loop.run_until_complete(self._task)
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._run())
+        self._last_drain = time.monotonic()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Cancels the consumer from any thread and waits for its event loop to close."""
+        if not self.running:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            # The loop closed on its own between the check and the call
+            pass
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def drain(self):
+        """Returns all deltas produced since the last call, oldest first."""
+        self._last_drain = time.monotonic()
+        deltas = []
+        while True:
+            try:
+                deltas.append(self._deltas.get_nowait())
+            except queue.Empty:
+                return deltas
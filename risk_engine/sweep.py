@@ -0,0 +1,250 @@
+"""Headless parameter sweeps over the simulate -> risk profile -> appetite monitoring pipeline.
+
+Usage::
+
+    python -m risk_engine.sweep sweep.json --output results.parquet --workers 8
+
+The sweep spec is a JSON object::
+
+    {
+        "mode": "grid",                      # or "random"
+        "seed": 2025,                        # master seed; each run gets its own child seed
+        "base": {"start_date": "2022-01-01", "end_date": "2022-12-31"},
+        "grid": {"growth_rate": [0.01, 0.02], "loss_freq_mean": [1, 2, 4]},
+        "ranges": {"loss_sev_mean": [800, 2000]},  # random mode: uniform [low, high]
+        "n_runs": 500                        # random mode only
+    }
+
+Any key of ``DEFAULT_PARAMS`` can appear in ``base``, ``grid`` or ``ranges``;
+values are converted to the type of their default. Results are appended to a
+Parquet file in batches as runs complete. A run whose parameters the pipeline
+rejects is written as a row with its ``error`` and no results.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from risk_engine.montecarlo import risk_measures, simulate_aggregate_losses
+from risk_engine.pipeline import build_risk_profile, evaluate_risk_appetite
+from risk_engine.simulation import simulate_operations
+
+# Page 1 and page 2 sidebar defaults
+DEFAULT_PARAMS = {
+    'start_date': '2022-01-01',
+    'end_date': '2022-01-31',
+    'growth_rate': 0.02,
+    'loss_freq_model': 'Poisson',
+    'loss_freq_mean': 2.0,
+    'loss_freq_std': 1.0,
+    'loss_sev_model': 'Normal',
+    'loss_sev_mean': 1200.0,
+    'loss_sev_std': 300.0,
+    'kri_baseline': 50.0,
+    'kri_volatility': 5.0,
+    'MaxExpectedLoss_Threshold': 1300.0,
+    'MaxUnexpectedLoss_Threshold': 380.0,
+    'MaxSevereLossEvents_Threshold': 5,
+    'SevereLoss_Threshold': 2000.0,
+    'KRI_Limit': 55.0,
+    'RiskCapacity': 50000.0,
+    'window_days': 30,
+    'mc_scenarios': 10_000,
+    'mc_period_days': 1,
+    'confidence': 0.99,
+}
+
+APPETITE_KEYS = (
+    'MaxExpectedLoss_Threshold', 'MaxUnexpectedLoss_Threshold', 'MaxSevereLossEvents_Threshold',
+    'SevereLoss_Threshold', 'KRI_Limit', 'RiskCapacity'
+)
+
+_ARROW_TYPES = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+
+# Declared up front so every batch, including one of only failed runs, writes the same columns
+RESULT_SCHEMA = pa.schema(
+    [('run_id', pa.int64()), ('seed', pa.int64())]
+    + [(name, _ARROW_TYPES[type(default)]) for name, default in DEFAULT_PARAMS.items()]
+    + [(name, pa.int64()) for name in ('n_days', 'n_losses')]
+    + [(name, pa.float64()) for name in ('el_mean', 'el_max', 'ul_mean', 'ul_max')]
+    + [(name, pa.int64()) for name in ('el_breach_days', 'ul_breach_days', 'max_severe_in_window', 'severe_breach_days', 'kri_breach_days')]
+    + [(name, pa.float64()) for name in ('mc_expected_loss', 'mc_var', 'mc_expected_shortfall', 'elapsed_seconds')]
+    + [('error', pa.string())]
+)
+
+
+def _coerce(name, value):
+    """Converts a spec value to the type of its ``DEFAULT_PARAMS`` entry, so grid values like ``[1, 2.5]`` share one column type."""
+    kind = type(DEFAULT_PARAMS[name])
+    if kind is int:
+        if float(value) != int(value):
+            raise ValueError(f"Sweep parameter {name!r} must be an integer, got {value!r}.")
+        return int(value)
+    return kind(value)
+
+
+def _draw(sampler, name, low, high):
+    """Draws a uniform value, rounded for parameters whose default is an integer."""
+    value = float(sampler.uniform(low, high))
+    return int(round(value)) if isinstance(DEFAULT_PARAMS[name], int) else value
+
+
+def iter_runs(spec):
+    """Yields ``(run_id, params, seed)`` for every run described by the sweep spec, lazily."""
+    mode = spec.get('mode', 'grid')
+    base = {**DEFAULT_PARAMS, **spec.get('base', {})}
+    unknown = (set(base) | set(spec.get('grid', {})) | set(spec.get('ranges', {}))) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    master = np.random.SeedSequence(spec.get('seed'))
+
+    if mode == 'grid':
+        grid = spec.get('grid', {})
+        names = list(grid)
+        combinations = itertools.product(*(grid[name] for name in names))
+        overrides = (dict(zip(names, values)) for values in combinations)
+    elif mode == 'random':
+        ranges = spec.get('ranges', {})
+        sampler = np.random.default_rng(np.random.SeedSequence(master.entropy, spawn_key=(1,)))
+        overrides = (
+            {name: _draw(sampler, name, low, high) for name, (low, high) in ranges.items()}
+            for _ in range(int(spec['n_runs']))
+        )
+    else:
+        raise ValueError("mode must be 'grid' or 'random'.")
+
+    for run_id, override in enumerate(overrides):
+        # Child seeds are derived from the run position so any run can be reproduced on its own
+        seed = int(np.random.SeedSequence(master.entropy, spawn_key=(0, run_id)).generate_state(1)[0])
+        params = {name: _coerce(name, value) for name, value in {**base, **override}.items()}
+        yield run_id, params, seed
+
+
+def run_one(run_id, params, seed):
+    """Runs the full pipeline for one parameter set and returns a flat row of summary results."""
+    started = time.perf_counter()
+    loss_freq_params = {'model': params['loss_freq_model'], 'mean': params['loss_freq_mean'], 'std': params['loss_freq_std']}
+    loss_sev_params = {'model': params['loss_sev_model'], 'mean': params['loss_sev_mean'], 'std': params['loss_sev_std']}
+    appetite_params = {key: params[key] for key in APPETITE_KEYS}
+
+    df_ops, loss_events = simulate_operations(
+        datetime.fromisoformat(params['start_date']), datetime.fromisoformat(params['end_date']),
+        {'growth_rate': params['growth_rate']},
+        loss_freq_params, loss_sev_params,
+        {'baseline': params['kri_baseline'], 'volatility': params['kri_volatility']},
+        rng=np.random.default_rng(seed)
+    )
+    df_risk_profile = build_risk_profile(df_ops, loss_events, appetite_params, window_days=int(params['window_days']))
+    df_breaches, df_kri_status = evaluate_risk_appetite(df_risk_profile, appetite_params)
+    df_mc = risk_measures(
+        simulate_aggregate_losses(int(params['mc_scenarios']), loss_freq_params, loss_sev_params,
+                                  period_days=int(params['mc_period_days']), seed=seed),
+        (params['confidence'],)
+    )
+
+    row = {'run_id': run_id, 'seed': seed, **params}
+    row.update({
+        'n_days': len(df_ops),
+        'n_losses': len(loss_events),
+        'el_mean': float(df_risk_profile['ExpectedLoss'].mean()),
+        'el_max': float(df_risk_profile['ExpectedLoss'].max()),
+        'ul_mean': float(df_risk_profile['UnexpectedLoss'].mean()),
+        'ul_max': float(df_risk_profile['UnexpectedLoss'].max()),
+        'el_breach_days': int((df_breaches['ExpectedLoss_Status'] == 'Breached').sum()),
+        'ul_breach_days': int((df_breaches['UnexpectedLoss_Status'] == 'Breached').sum()),
+        'max_severe_in_window': int(df_risk_profile['SevereLossEvents'].max()),
+        'severe_breach_days': int((df_breaches['SevereLossEvents_Status'] == 'Breached').sum()),
+        'kri_breach_days': int((df_kri_status['KRI_Status'] == 'Above Limit').sum()),
+        'mc_expected_loss': float(df_mc['ExpectedLoss'].iloc[0]),
+        'mc_var': float(df_mc['VaR'].iloc[0]),
+        'mc_expected_shortfall': float(df_mc['ExpectedShortfall'].iloc[0]),
+        'elapsed_seconds': time.perf_counter() - started,
+        'error': None,
+    })
+    return row
+
+
+def run_one_or_error(run_id, params, seed):
+    """Runs ``run_one``, turning an invalid parameter combination into a row with only its ``error`` set."""
+    try:
+        return run_one(run_id, params, seed)
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        return {'run_id': run_id, 'seed': seed, **params, 'error': f"{type(e).__name__}: {e}"}
+
+
+def run_sweep(spec, output_path, n_workers=None, batch_size=64, progress=None):
+    """Fans the sweep out over a process pool and streams result rows to ``output_path`` as Parquet.
+
+    At most a few runs per worker are in flight and results are flushed every
+    ``batch_size`` rows, so memory stays flat however large the sweep is.
+    Returns the number of completed runs, including failed ones.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    runs = iter_runs(spec)
+    pending = set()
+    batch = []
+    writer = None
+    completed = 0
+
+    def flush():
+        nonlocal writer
+        if not batch:
+            return
+        table = pa.Table.from_pylist(batch, schema=RESULT_SCHEMA)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, RESULT_SCHEMA)
+        writer.write_table(table)
+        batch.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            for run in itertools.islice(runs, 2 * n_workers):
+                pending.add(executor.submit(run_one_or_error, *run))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch.append(future.result())
+                    completed += 1
+                    next_run = next(runs, None)
+                    if next_run is not None:
+                        pending.add(executor.submit(run_one_or_error, *next_run))
+                if len(batch) >= batch_size:
+                    flush()
+                if progress is not None:
+                    progress(completed)
+        flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless risk appetite parameter sweep.")
+    parser.add_argument('spec', help="Path to the JSON sweep spec.")
+    parser.add_argument('-o', '--output', default='sweep_results.parquet', help="Parquet file to write results to.")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Number of worker processes (default: all cores).")
+    parser.add_argument('--batch-size', type=int, default=64, help="Rows buffered before each write to the output file.")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+
+    started = time.perf_counter()
+    completed = run_sweep(
+        spec, args.output, n_workers=args.workers, batch_size=args.batch_size,
+        progress=lambda n: print(f"\r{n} runs completed", end='', file=sys.stderr)
+    )
+    print(f"\nWrote {completed} runs to {args.output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
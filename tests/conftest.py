@@ -0,0 +1,23 @@
+"""Shared fixtures for the risk engine tests."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def random_losses():
+    """Returns a factory for ``(day_offsets, amounts)`` of random loss events in arrival order."""
+    def make(rng, n_days, mean_per_day=2.0, rounded=False):
+        counts = rng.poisson(mean_per_day, n_days)
+        day_offsets = np.repeat(np.arange(n_days), counts)
+        amounts = rng.lognormal(7.0, 0.6, len(day_offsets))
+        if rounded:
+            # Coarse amounts so thresholds land exactly on (tied) losses
+            amounts = np.round(amounts, -2)
+        order = rng.permutation(len(day_offsets))
+        return day_offsets[order], amounts[order]
+    return make
@@ -0,0 +1,56 @@
+"""Checks the columnar breach rules against a row-by-row evaluation."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from risk_engine.breaches import BreachRule, evaluate_breaches, kri_rules
+from risk_engine.pipeline import evaluate_risk_appetite
+
+
+def make_profile(n_days=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Date': pd.date_range('2022-01-01', periods=n_days),
+        'ExpectedLoss': rng.uniform(0, 2000, n_days),
+        'UnexpectedLoss': rng.uniform(0, 800, n_days),
+        'SevereLossEvents': rng.integers(0, 5, n_days),
+        'KRI': rng.normal(60, 10, n_days),
+    })
+
+
+def test_statuses_match_row_by_row_evaluation():
+    df_profile = make_profile()
+    params = {
+        'MaxExpectedLoss_Threshold': 1000.0,
+        'MaxUnexpectedLoss_Threshold': 400.0,
+        'MaxSevereLossEvents_Threshold': 2,
+        'KRI_Limit': 65.0,
+    }
+    df_breaches, df_kri_status = evaluate_risk_appetite(df_profile, params)
+
+    for column, param in [('ExpectedLoss', 'MaxExpectedLoss_Threshold'), ('UnexpectedLoss', 'MaxUnexpectedLoss_Threshold'),
+                          ('SevereLossEvents', 'MaxSevereLossEvents_Threshold')]:
+        status = df_breaches[f"{column}_Status"]
+        assert isinstance(status.dtype, pd.CategoricalDtype)
+        expected = ['Breached' if value > params[param] else 'Within Appetite' for value in df_profile[column]]
+        assert list(status) == expected
+    expected_kri = ['Above Limit' if value > params['KRI_Limit'] else 'Within Limit' for value in df_profile['KRI']]
+    assert list(df_kri_status['KRI_Status']) == expected_kri
+    assert (df_breaches['Date'] == df_profile['Date']).all()
+
+
+def test_value_equal_to_threshold_is_within_appetite():
+    df_profile = pd.DataFrame({'Date': pd.date_range('2022-01-01', periods=3), 'ExpectedLoss': [99.0, 100.0, 101.0]})
+    df_status = evaluate_breaches(df_profile, [BreachRule('ExpectedLoss', 100.0)])
+    assert list(df_status['ExpectedLoss_Status']) == ['Within Appetite', 'Within Appetite', 'Breached']
+    df_status = evaluate_breaches(df_profile, [BreachRule('ExpectedLoss', 100.0, '>=', 'AtLimit')])
+    assert list(df_status['AtLimit']) == ['Within Appetite', 'Breached', 'Breached']
+
+
+def test_missing_columns_and_unknown_comparators():
+    df_profile = make_profile(5).drop(columns='KRI')
+    assert list(evaluate_breaches(df_profile, kri_rules({'KRI_Limit': 50.0})).columns) == ['Date']
+    _, df_kri_status = evaluate_risk_appetite(df_profile, {'KRI_Limit': 50.0})
+    assert (df_kri_status['KRI_Status'] == 'N/A').all()
+    with pytest.raises(ValueError, match="comparator"):
+        evaluate_breaches(df_profile, [BreachRule('ExpectedLoss', 1.0, '!=')])
@@ -0,0 +1,43 @@
+"""Checks that memoized results are keyed by content, not by the object passed in."""
+import numpy as np
+import pandas as pd
+
+from risk_engine.cache import LRUCache, memoize, tag_fingerprint
+
+
+def test_derived_frames_do_not_share_a_fingerprint():
+    @memoize(LRUCache())
+    def total(df):
+        return float(df['x'].sum())
+
+    df = tag_fingerprint(pd.DataFrame({'x': np.arange(10.0)}), 'scenario')
+    assert total(df) == 45.0
+    assert total(df.head(3)) == 3.0
+    assert total(df[df['x'] > 5]) == 30.0
+    assert total(df.assign(x=0.0)) == 0.0
+
+
+def test_untagged_frames_are_keyed_by_order_labels_and_dtypes():
+    @memoize(LRUCache())
+    def first_row(df):
+        return df.iloc[0].to_dict()
+
+    assert first_row(pd.DataFrame({'x': [1, 2, 3]})) == {'x': 1}
+    # A sum of row hashes ignores row order, and hash_pandas_object ignores column names
+    assert first_row(pd.DataFrame({'x': [3, 2, 1]})) == {'x': 3}
+    assert first_row(pd.DataFrame({'y': [1, 2, 3]})) == {'y': 1}
+    assert first_row(pd.DataFrame({'x': [1.0, 2.0, 3.0]})) == {'x': 1.0}
+    assert first_row(pd.DataFrame({'x': [1, 2], 'y': [3, 4]})) == {'x': 1, 'y': 3}
+    assert first_row(pd.DataFrame({'y': [1, 2], 'x': [3, 4]})) == {'y': 1, 'x': 3}
+
+
+def test_equal_untagged_frames_share_an_entry():
+    cache = LRUCache()
+
+    @memoize(cache)
+    def total(df):
+        return float(df['x'].sum())
+
+    total(pd.DataFrame({'x': [1.0, 2.0]}))
+    total(pd.DataFrame({'x': [1.0, 2.0]}))
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,56 @@
+"""Checks capacity exhaustion days against a per-path scan."""
+import numpy as np
+import pytest
+
+from risk_engine.capacity import CapacityPaths, _simulate_path_chunk, paths_within_budget, simulate_capacity_paths
+from risk_engine.distributions import make_frequency, make_severity
+from risk_engine.montecarlo import _chunk_sizes
+
+
+def test_capacity_paths_match_brute_force():
+    rng = np.random.default_rng(7)
+    n_paths, n_days = 40, 90
+    daily_totals = rng.exponential(1000.0, (n_paths, n_days)) * (rng.random((n_paths, n_days)) < 0.6)
+    cumulative = np.cumsum(daily_totals, axis=1)
+    paths = CapacityPaths(cumulative)
+    in_place = CapacityPaths(cumulative.copy(), copy=False)
+
+    capacities = [-5.0, 0.0, 1.0, float(np.median(cumulative)), float(cumulative.max()), float(cumulative.max()) * 2]
+    # Exact cumulative values exercise the "reaches capacity" boundary
+    capacities += list(rng.choice(cumulative.ravel(), 10))
+    for capacity in capacities:
+        expected = np.array([
+            next((day for day in range(n_days) if path[day] >= capacity), n_days)
+            for path in cumulative
+        ])
+        np.testing.assert_array_equal(paths.exhaustion_days(capacity), expected)
+        np.testing.assert_array_equal(in_place.exhaustion_days(capacity), expected)
+
+    distribution = paths.exhaustion_distribution(float(np.median(cumulative)))
+    assert distribution['CumulativeProbability'].iloc[-1] == pytest.approx(
+        np.mean(cumulative[:, -1] >= np.median(cumulative))
+    )
+
+
+def test_simulated_paths_stay_within_the_cell_budget():
+    assert paths_within_budget(2000, 365) == 2000
+    assert paths_within_budget(2000, 18250, max_cells=8_000_000) == 438
+    assert paths_within_budget(10, 10 ** 9) == 1
+    with pytest.raises(ValueError, match="path-days"):
+        simulate_capacity_paths(2000, 18250, {'mean': 2.0}, {'mean': 1000.0, 'std': 200.0}, max_cells=8_000_000)
+
+
+def test_chunked_simulation_fills_the_index_in_place():
+    freq, sev = {'model': 'Poisson', 'mean': 2.0}, {'model': 'Gamma', 'mean': 1000.0, 'std': 400.0}
+    paths = simulate_capacity_paths(50, 120, freq, sev, seed=4, max_draws_per_chunk=1000)
+    assert (paths.n_paths, paths.n_days) == (50, 120)
+    # Rebuild the same chunks directly and check the index answers like a fresh copy of them
+    sizes = _chunk_sizes(50, 2.0 * 120, 1000)
+    seeds = np.random.SeedSequence(4).spawn(len(sizes))
+    cumulative = np.concatenate([
+        _simulate_path_chunk(size, 120, make_frequency(freq), make_severity(sev), seq) for size, seq in zip(sizes, seeds)
+    ])
+    np.testing.assert_array_equal(paths.final_losses, cumulative[:, -1])
+    reference = CapacityPaths(cumulative)
+    for capacity in np.quantile(cumulative[:, -1], [0.1, 0.5, 0.9]):
+        np.testing.assert_array_equal(paths.exhaustion_days(capacity), reference.exhaustion_days(capacity))
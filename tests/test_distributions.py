@@ -0,0 +1,71 @@
+"""Checks the frequency and severity models against their requested moments."""
+import numpy as np
+import pytest
+
+from risk_engine.distributions import (
+    Binomial, GeneralizedPareto, NegativeBinomial, Poisson, make_frequency, make_severity,
+)
+
+
+@pytest.mark.parametrize('model, mean, std', [
+    ('Lognormal', 1000.0, 200.0),
+    ('Lognormal', 1000.0, 3000.0),
+    ('Gamma', 1000.0, 200.0),
+    ('Gamma', 50.0, 80.0),
+    ('Pareto (GPD)', 1000.0, 200.0),
+    ('Pareto (GPD)', 1000.0, 1500.0),
+])
+def test_severity_from_moments_hits_mean_and_std(model, mean, std):
+    severity = make_severity({'model': model, 'mean': mean, 'std': std})
+    assert severity._dist.mean() == pytest.approx(mean, rel=1e-9)
+    assert severity._dist.std() == pytest.approx(std, rel=1e-9)
+
+
+@pytest.mark.parametrize('model, mean, std', [
+    ('Poisson', 4.0, 2.0),
+    ('Negative Binomial', 4.0, 3.0),
+    ('Binomial', 4.0, 1.5),
+])
+def test_frequency_from_moments_hits_mean_and_std(model, mean, std):
+    frequency = make_frequency({'model': model, 'mean': mean, 'std': std})
+    counts = frequency.sample(400_000, np.random.default_rng(0))
+    assert counts.mean() == pytest.approx(mean, rel=0.01)
+    # Binomial rounds its number of trials, so its std is only close to the request
+    assert counts.std() == pytest.approx(std, rel=0.01 if model != 'Binomial' else 0.05)
+
+
+def test_scaled_frequency_is_the_sum_over_periods():
+    rng = np.random.default_rng(1)
+    for frequency in (Poisson(2.5), NegativeBinomial.from_moments(2.5, 2.0), Binomial.from_moments(2.5, 1.2)):
+        single = frequency.sample((200_000, 7), rng).sum(axis=1)
+        scaled = frequency.scaled(7).sample(200_000, rng)
+        assert scaled.mean() == pytest.approx(single.mean(), rel=0.01)
+        assert scaled.std() == pytest.approx(single.std(), rel=0.02)
+
+
+def test_gpd_tail_stays_heavy_when_std_is_below_mean():
+    # With std < mean the exact loc = 0 fit has a negative shape, which capped every loss at about 1360
+    severity = GeneralizedPareto.from_moments(1000.0, 200.0)
+    assert severity.shape >= GeneralizedPareto.MIN_SHAPE
+    assert severity.loc >= 0.0
+    assert severity.ppf(1 - 1e-6) > 3000.0
+    samples = severity.sample(1_000_000, np.random.default_rng(2))
+    assert samples.min() >= severity.loc
+    assert samples.mean() == pytest.approx(1000.0, rel=0.01)
+
+
+@pytest.mark.parametrize('model', ['Normal', 'Lognormal', 'Gamma', 'Pareto (GPD)', 'Spliced Lognormal + GPD Tail'])
+def test_samples_follow_ppf(model):
+    severity = make_severity({'model': model, 'mean': 1000.0, 'std': 400.0})
+    samples = severity.sample(200_000, np.random.default_rng(3))
+    levels = np.array([0.1, 0.5, 0.9, 0.99])
+    np.testing.assert_allclose(np.quantile(samples, levels), severity.ppf(levels), rtol=0.02)
+
+
+def test_invalid_moments_raise():
+    with pytest.raises(ValueError):
+        NegativeBinomial.from_moments(4.0, 1.0)
+    with pytest.raises(ValueError):
+        Binomial.from_moments(4.0, 3.0)
+    with pytest.raises(ValueError):
+        make_severity({'model': 'Cauchy'})
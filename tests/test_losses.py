@@ -0,0 +1,51 @@
+"""Checks the day-grouped loss event container against per-day brute force."""
+import numpy as np
+import pandas as pd
+
+from risk_engine.losses import LossEvents
+from risk_engine.profile import RollingRiskProfile
+
+START = np.datetime64('2022-01-01', 'D')
+
+
+def test_loss_events_match_brute_force(random_losses):
+    rng = np.random.default_rng(11)
+    n_days = 60
+    day_offsets, amounts = random_losses(rng, n_days)
+    loss_events = LossEvents.from_day_offsets(START, day_offsets, amounts, n_days)
+
+    assert len(loss_events) == len(amounts)
+    for day in range(n_days):
+        # Grouped by day, keeping arrival order within the day
+        segment = loss_events.amounts[loss_events.day_ptr[day]:loss_events.day_ptr[day + 1]]
+        np.testing.assert_array_equal(segment, amounts[day_offsets == day])
+
+    stats = loss_events.daily_stats()
+    for day in range(n_days):
+        x = amounts[day_offsets == day]
+        np.testing.assert_allclose(stats[:, day], [x.sum(), len(x), (x * x).sum()])
+
+    df_losses = loss_events.to_frame()
+    expected_dates = (START + np.sort(day_offsets, kind='stable')).astype('datetime64[ns]')
+    np.testing.assert_array_equal(df_losses['Date'].to_numpy(), expected_dates)
+    rebuilt = LossEvents.from_frame(df_losses, pd.date_range(str(START), periods=n_days))
+    np.testing.assert_array_equal(rebuilt.day_offsets, loss_events.day_offsets)
+    np.testing.assert_array_equal(rebuilt.amounts, loss_events.amounts)
+
+
+def test_extend_with_daily_stats_matches_update(random_losses):
+    rng = np.random.default_rng(3)
+    n_days = 200
+    day_offsets, amounts = random_losses(rng, n_days)
+    loss_events = LossEvents.from_day_offsets(START, day_offsets, amounts, n_days)
+    dates = START + np.arange(n_days)
+
+    extended = RollingRiskProfile(window_days=10)
+    stats = loss_events.daily_stats()
+    for start in range(0, n_days, 50):
+        extended.extend(dates[start:start + 50], stats[:, start:start + 50])
+    updated = RollingRiskProfile(window_days=10)
+    updated.update(dates, dates[day_offsets], amounts)
+
+    np.testing.assert_allclose(extended.expected_loss, updated.expected_loss)
+    np.testing.assert_allclose(extended.unexpected_loss, updated.unexpected_loss)
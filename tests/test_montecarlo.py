@@ -0,0 +1,44 @@
+"""Checks Monte Carlo aggregate losses and their VaR / Expected Shortfall."""
+import numpy as np
+import pytest
+
+from risk_engine.montecarlo import risk_measures, simulate_aggregate_losses
+
+FREQ = {'model': 'Poisson', 'mean': 3.0}
+SEV = {'model': 'Lognormal', 'mean': 1000.0, 'std': 400.0}
+
+
+def test_risk_measures_match_quantile_and_tail_mean():
+    rng = np.random.default_rng(1)
+    losses = rng.lognormal(8.0, 1.0, 20_001)
+    levels = (0.5, 0.9, 0.99, 0.999)
+    df_risk = risk_measures(losses, levels)
+
+    np.testing.assert_allclose(df_risk['ExpectedLoss'], losses.mean())
+    np.testing.assert_allclose(df_risk['VaR'], np.quantile(losses, levels))
+    expected_shortfall = [losses[losses >= np.quantile(losses, level)].mean() for level in levels]
+    np.testing.assert_allclose(df_risk['ExpectedShortfall'], expected_shortfall)
+    np.testing.assert_allclose(df_risk['UnexpectedLoss'], df_risk['VaR'] - losses.mean())
+
+
+def test_aggregate_losses_have_compound_poisson_moments():
+    losses = simulate_aggregate_losses(200_000, FREQ, SEV, period_days=2, seed=3)
+    # E[S] = E[N] E[X] and Var[S] = E[N] E[X^2] for a compound Poisson sum
+    mean_count = FREQ['mean'] * 2
+    assert losses.mean() == pytest.approx(mean_count * SEV['mean'], rel=0.01)
+    assert losses.var() == pytest.approx(mean_count * (SEV['std'] ** 2 + SEV['mean'] ** 2), rel=0.03)
+
+
+def test_results_depend_on_seed_not_workers():
+    kwargs = dict(period_days=1, seed=7, max_draws_per_chunk=5_000)
+    serial = simulate_aggregate_losses(20_000, FREQ, SEV, n_workers=1, **kwargs)
+    parallel = simulate_aggregate_losses(20_000, FREQ, SEV, n_workers=2, **kwargs)
+    np.testing.assert_array_equal(serial, parallel)
+    assert not np.array_equal(serial, simulate_aggregate_losses(20_000, FREQ, SEV, n_workers=1, period_days=1, seed=8,
+                                                                max_draws_per_chunk=5_000))
+
+
+def test_runs_over_the_draw_budget_are_refused():
+    with pytest.raises(ValueError, match="reduce the scenarios"):
+        simulate_aggregate_losses(1_000_000, {'mean': 10.0, 'std': 3.0}, SEV, period_days=365, max_total_draws=100_000_000)
+    assert len(simulate_aggregate_losses(1_000, FREQ, SEV, period_days=365, seed=0, max_total_draws=100_000_000)) == 1_000
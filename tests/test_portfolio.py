@@ -0,0 +1,76 @@
+"""Checks the portfolio panel: correlated KRIs, the shared growth curve and per-line risk."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from risk_engine.portfolio import (
+    breach_summary, correlated_kris, equicorrelation, evaluate_portfolio_breaches, simulate_portfolio,
+)
+from risk_engine.profile import SUM, SUMSQ, RollingRiskProfile
+from risk_engine.simulation import simulate_operations
+
+KRI_PARAMS = {'names': ['A', 'B', 'C'], 'means': [50.0, 10.0, 0.0], 'stds': [5.0, 1.0, 2.0], 'correlation': equicorrelation(3, 0.6)}
+
+
+def make_lines(growth_rates):
+    return [
+        {'name': f"Line {i}", 'growth_rate': growth_rate,
+         'loss_freq_params': {'model': 'Poisson', 'mean': 1.5}, 'loss_sev_params': {'model': 'Lognormal', 'mean': 1000, 'std': 300}}
+        for i, growth_rate in enumerate(growth_rates)
+    ]
+
+
+def test_kris_have_the_requested_correlation_and_moments():
+    correlation = np.array([[1.0, 0.8, -0.3], [0.8, 1.0, 0.0], [-0.3, 0.0, 1.0]])
+    kri = correlated_kris(4, 50_000, KRI_PARAMS['means'], KRI_PARAMS['stds'], correlation, np.random.default_rng(0))
+    assert kri.shape == (4, 3, 50_000)
+    for line in kri:
+        np.testing.assert_allclose(np.corrcoef(line), correlation, atol=0.02)
+        np.testing.assert_allclose(line.mean(axis=1), KRI_PARAMS['means'], atol=0.05)
+        np.testing.assert_allclose(line.std(axis=1), KRI_PARAMS['stds'], rtol=0.02)
+
+
+def test_invalid_correlations_are_rejected():
+    with pytest.raises(ValueError, match="symmetric"):
+        correlated_kris(1, 10, 0.0, 1.0, [[1.0, 0.5], [0.2, 1.0]], np.random.default_rng(0))
+    with pytest.raises(ValueError, match="positive definite"):
+        correlated_kris(1, 10, 0.0, 1.0, [[1.0, 1.0], [1.0, 1.0]], np.random.default_rng(0))
+    with pytest.raises(ValueError, match="rho"):
+        equicorrelation(3, -0.6)
+
+
+def test_business_volume_matches_simulate_operations():
+    start, end = datetime(2022, 1, 1), datetime(2023, 12, 31)
+    panel = simulate_portfolio(start, end, make_lines([0.0, 0.01, 0.002]), KRI_PARAMS, rng=np.random.default_rng(1))
+    for growth_rate, volume in zip([0.0, 0.01, 0.002], panel.business_volume):
+        df_operations, _ = simulate_operations(start, end, {'growth_rate': growth_rate}, {'mean': 1}, {}, {}, rng=np.random.default_rng(1))
+        np.testing.assert_array_equal(volume, df_operations['BusinessVolume'])
+
+
+def test_overflowing_growth_rate_raises():
+    # Without the shared guard this line's volume silently became inf
+    with pytest.raises(ValueError, match="overflows"):
+        simulate_portfolio(datetime(2000, 1, 1), datetime(2049, 12, 31), make_lines([0.01, 0.1]), KRI_PARAMS,
+                           rng=np.random.default_rng(0))
+
+
+def test_rolling_risk_and_breaches_match_per_line_profiles():
+    panel = simulate_portfolio(datetime(2022, 1, 1), datetime(2022, 6, 30), make_lines([0.01] * 3), KRI_PARAMS,
+                               rng=np.random.default_rng(2))
+    expected_loss, unexpected_loss = panel.rolling_risk(14)
+    for line in range(3):
+        profile = RollingRiskProfile(window_days=14)
+        profile.extend(panel.dates, panel.loss_stats[:, line])
+        np.testing.assert_allclose(expected_loss[line], profile.expected_loss)
+        np.testing.assert_allclose(unexpected_loss[line], profile.unexpected_loss)
+    assert (panel.loss_stats[SUMSQ] >= 0).all() and (panel.loss_stats[SUM] >= 0).all()
+
+    limits = {'MaxExpectedLoss_Threshold': [900.0, 1000.0, 1100.0], 'MaxUnexpectedLoss_Threshold': 350.0, 'KRI_Limit': [55.0, 11.0, 2.0]}
+    breaches = evaluate_portfolio_breaches(panel, limits, window_days=14)
+    df_summary = breach_summary(panel, breaches)
+    assert len(df_summary) == 3 * 5
+    row = df_summary[(df_summary['BusinessLine'] == 'Line 1') & (df_summary['Measure'] == 'KRI: B')].iloc[0]
+    above = panel.kri[1, 1] > 11.0
+    assert row['BreachDays'] == above.sum()
+    assert row['LastBreach'] == panel.dates[np.flatnonzero(above)[-1]]
@@ -0,0 +1,90 @@
+"""Checks the incremental and EWMA risk profile against a per-day brute-force recomputation."""
+import numpy as np
+import pytest
+
+from risk_engine.profile import MIN_EWMA_HALFLIFE, RollingRiskProfile
+
+START = np.datetime64('2022-01-01', 'D')
+
+
+def brute_force_profile(day_offsets, amounts, n_days, window_days, ewma_halflife):
+    """EL (mean) and UL (sample std) of the losses in each day's trailing window or EWMA weighting."""
+    expected_loss = np.zeros(n_days)
+    unexpected_loss = np.zeros(n_days)
+    for day in range(n_days):
+        if ewma_halflife is None:
+            in_window = (day_offsets <= day) & (day_offsets > day - window_days)
+            x = amounts[in_window]
+            if len(x):
+                expected_loss[day] = x.mean()
+            if len(x) > 1:
+                unexpected_loss[day] = x.std(ddof=1)
+        else:
+            seen = day_offsets <= day
+            weights = 0.5 ** ((day - day_offsets[seen]) / ewma_halflife)
+            x = amounts[seen]
+            total, count, sumsq = (weights * x).sum(), weights.sum(), (weights * x * x).sum()
+            if count > 0:
+                expected_loss[day] = total / count
+            if count > 1:
+                unexpected_loss[day] = np.sqrt(max((sumsq - count * expected_loss[day] ** 2) / (count - 1), 0.0))
+    return expected_loss, unexpected_loss
+
+
+@pytest.mark.parametrize('window_days, ewma_halflife', [(1, None), (7, None), (30, None), (30, 0.5), (30, 5.0), (30, 60.0)])
+def test_incremental_update_matches_full_recompute(random_losses, window_days, ewma_halflife):
+    rng = np.random.default_rng(window_days)
+    # Long enough to cross several closed-form EWMA blocks
+    n_days = 600
+    day_offsets, amounts = random_losses(rng, n_days)
+    dates = START + np.arange(n_days)
+
+    incremental = RollingRiskProfile(window_days=window_days, ewma_halflife=ewma_halflife)
+    boundaries = np.sort(rng.choice(np.arange(1, n_days), 12, replace=False))
+    previous = 0
+    for boundary in list(boundaries) + [n_days]:
+        # Each batch adds its new days plus its losses, some of which are backdated onto earlier days
+        batch = (day_offsets >= previous) & (day_offsets < boundary)
+        backdated = rng.random(batch.sum()) < 0.2
+        batch_days = day_offsets[batch]
+        batch_days[backdated] = rng.integers(0, boundary, backdated.sum())
+        day_offsets[batch] = batch_days
+        incremental.update(dates[previous:boundary], dates[batch_days], amounts[batch])
+        previous = boundary
+
+    full = RollingRiskProfile(window_days=window_days, ewma_halflife=ewma_halflife)
+    full.update(dates, dates[day_offsets], amounts)
+
+    expected_loss, unexpected_loss = brute_force_profile(day_offsets, amounts, n_days, window_days, ewma_halflife)
+    np.testing.assert_allclose(full.expected_loss, expected_loss, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(full.unexpected_loss, unexpected_loss, rtol=1e-6, atol=1e-4)
+    np.testing.assert_allclose(incremental.expected_loss, full.expected_loss, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(incremental.unexpected_loss, full.unexpected_loss, rtol=1e-6, atol=1e-4)
+
+
+def test_update_rejects_dates_before_the_profile():
+    profile = RollingRiskProfile(window_days=5)
+    profile.update(START + np.arange(3), [], [])
+    with pytest.raises(ValueError):
+        profile.update(START + np.arange(2, 4), [], [])
+
+
+@pytest.mark.parametrize('ewma_halflife', [MIN_EWMA_HALFLIFE, 0.26])
+def test_short_half_lives_stay_finite(random_losses, ewma_halflife):
+    # decay ** -256 overflowed for half-lives under about 0.26 days and the profile filled with inf/NaN
+    rng = np.random.default_rng(2)
+    n_days = 600
+    day_offsets, amounts = random_losses(rng, n_days)
+    profile = RollingRiskProfile(ewma_halflife=ewma_halflife)
+    profile.update(START + np.arange(n_days), START + day_offsets, amounts)
+
+    assert np.isfinite(profile.expected_loss).all() and np.isfinite(profile.unexpected_loss).all()
+    expected_loss, unexpected_loss = brute_force_profile(day_offsets, amounts, n_days, 30, ewma_halflife)
+    np.testing.assert_allclose(profile.expected_loss, expected_loss, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(profile.unexpected_loss, unexpected_loss, rtol=1e-6, atol=1e-4)
+
+
+@pytest.mark.parametrize('ewma_halflife', [0.0, -1.0, MIN_EWMA_HALFLIFE / 2, float('nan')])
+def test_half_lives_below_the_minimum_are_rejected(ewma_halflife):
+    with pytest.raises(ValueError, match="ewma_halflife"):
+        RollingRiskProfile(ewma_halflife=ewma_halflife)
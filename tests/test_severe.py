@@ -0,0 +1,26 @@
+"""Checks the sorted per-day severe-loss index against direct window counts."""
+import numpy as np
+import pytest
+
+from risk_engine.severe import SevereLossIndex
+
+
+@pytest.mark.parametrize('window_days', [1, 5, 30])
+def test_severe_loss_index_matches_brute_force(random_losses, window_days):
+    rng = np.random.default_rng(window_days)
+    n_days = 120
+    day_offsets, amounts = random_losses(rng, n_days, mean_per_day=3.0, rounded=True)
+    index = SevereLossIndex(day_offsets, amounts, n_days)
+
+    thresholds = [-1.0, 0.0, float(np.median(amounts)), float(amounts.max()), float(amounts.max()) + 1.0]
+    thresholds += list(rng.choice(amounts, 5))
+    for threshold in thresholds:
+        daily = np.bincount(day_offsets[amounts > threshold], minlength=n_days)
+        rolling = np.array([daily[max(day - window_days + 1, 0):day + 1].sum() for day in range(n_days)])
+        np.testing.assert_array_equal(index.daily_counts_above(threshold), daily)
+        np.testing.assert_array_equal(index.rolling_counts_above(threshold, window_days), rolling)
+
+
+def test_severe_loss_index_without_events():
+    index = SevereLossIndex([], [], 5)
+    np.testing.assert_array_equal(index.rolling_counts_above(100.0, 3), np.zeros(5))
@@ -0,0 +1,55 @@
+"""Checks the vectorized operations simulation."""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from risk_engine.simulation import simulate_operations
+
+FREQ = {'model': 'Poisson', 'mean': 2.0}
+SEV = {'model': 'Lognormal', 'mean': 1000.0, 'std': 500.0}
+KPI = {'baseline': 50, 'volatility': 5}
+
+
+def test_business_volume_matches_daily_compounding():
+    df_operations, _ = simulate_operations(
+        datetime(2022, 1, 1), datetime(2023, 2, 4), {'growth_rate': 0.01}, FREQ, SEV, KPI,
+        rng=np.random.default_rng(0)
+    )
+    volume = 100.0
+    expected = []
+    for _ in range(len(df_operations)):
+        expected.append(np.floor(volume))
+        volume *= 1.01
+    np.testing.assert_allclose(df_operations['BusinessVolume'], expected, rtol=1e-12)
+    np.testing.assert_allclose(df_operations['Revenue'], df_operations['BusinessVolume'] * 0.1)
+
+
+def test_long_horizon_business_volume_does_not_wrap():
+    # 50 years at 2% daily growth outgrows int64; it used to wrap to INT64_MIN
+    df_operations, _ = simulate_operations(
+        datetime(2000, 1, 1), datetime(2049, 12, 31), {'growth_rate': 0.02}, FREQ, SEV, KPI,
+        rng=np.random.default_rng(0)
+    )
+    volume = df_operations['BusinessVolume'].to_numpy()
+    assert volume.dtype == np.float64
+    assert np.isfinite(volume).all()
+    assert (np.diff(volume) >= 0).all()
+    assert volume[-1] > np.iinfo(np.int64).max
+
+
+def test_overflowing_growth_rate_raises():
+    with pytest.raises(ValueError, match="overflows"):
+        simulate_operations(
+            datetime(2000, 1, 1), datetime(2049, 12, 31), {'growth_rate': 0.1}, FREQ, SEV, KPI,
+            rng=np.random.default_rng(0)
+        )
+
+
+def test_same_seed_reproduces_the_scenario():
+    args = (datetime(2022, 1, 1), datetime(2022, 3, 31), {'growth_rate': 0.01}, FREQ, SEV, KPI)
+    df_a, losses_a = simulate_operations(*args, rng=np.random.default_rng(5))
+    df_b, losses_b = simulate_operations(*args, rng=np.random.default_rng(5))
+    assert df_a.equals(df_b)
+    np.testing.assert_array_equal(losses_a.amounts, losses_b.amounts)
+    assert losses_a.daily_counts().sum() == len(losses_a)
@@ -0,0 +1,124 @@
+"""Checks the on-disk scenario store: round trips, concurrent writers, failed renames and pruning."""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from risk_engine import store as store_module
+from risk_engine.simulation import simulate_operations
+from risk_engine.store import ScenarioStore, scenario_key
+
+
+def make_scenario(seed=0, end_date=datetime(2022, 3, 31)):
+    return simulate_operations(
+        datetime(2022, 1, 1), end_date, {'growth_rate': 0.01}, {'model': 'Poisson', 'mean': 2},
+        {'model': 'Lognormal', 'mean': 1000, 'std': 300}, {'baseline': 50, 'volatility': 5},
+        rng=np.random.default_rng(seed)
+    )
+
+
+def test_round_trip(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    df_operations, loss_events = make_scenario()
+    handle = store.save('abc', df_operations, loss_events, params={'seed': 0, 'start': datetime(2022, 1, 1)})
+
+    df_loaded, losses_loaded = store.load(handle)
+    assert df_loaded.equals(df_operations)
+    assert losses_loaded.start_date == loss_events.start_date
+    assert losses_loaded.n_days == loss_events.n_days
+    np.testing.assert_array_equal(losses_loaded.day_offsets, loss_events.day_offsets)
+    np.testing.assert_array_equal(losses_loaded.amounts, loss_events.amounts)
+    with pytest.raises(KeyError):
+        store.load(store.handle('missing'))
+
+
+def test_scenario_key_is_stable_and_parameter_sensitive():
+    params = ({'growth_rate': 0.01}, datetime(2022, 1, 1))
+    assert scenario_key(*params) == scenario_key({'growth_rate': 0.01}, datetime(2022, 1, 1))
+    assert scenario_key(*params) != scenario_key({'growth_rate': 0.02}, datetime(2022, 1, 1))
+
+
+def test_concurrent_saves_of_one_key(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    df_operations, loss_events = make_scenario()
+    handles, errors = [], []
+
+    def save():
+        try:
+            handles.append(store.save('shared', df_operations, loss_events))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors and len(handles) == 8
+    assert os.listdir(tmp_path) == ['shared']
+    assert store.load(handles[0])[0].equals(df_operations)
+
+
+def test_failed_rename_is_raised_and_cleaned_up(tmp_path, monkeypatch):
+    store = ScenarioStore(str(tmp_path))
+    df_operations, loss_events = make_scenario()
+
+    def failing_rename(src, dst):
+        raise PermissionError(f"cannot rename {src}")
+
+    monkeypatch.setattr(store_module.os, 'rename', failing_rename)
+    with pytest.raises(PermissionError):
+        store.save('abc', df_operations, loss_events)
+    assert os.listdir(tmp_path) == []
+
+
+def test_prune_removes_least_recently_used_and_expired(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    now = time.time()
+    for i, key in enumerate(['oldest', 'older', 'newer', 'newest']):
+        handle = store.save(key, *make_scenario(i))
+        os.utime(os.path.join(handle.path, store_module.PARAMS_FILE), (now - 100 + i, now - 100 + i))
+    scenario_bytes = store_module._directory_bytes(store.handle('newest').path)
+
+    # Loading marks a scenario as recently used
+    store.load(store.handle('oldest'))
+    store.max_bytes = int(scenario_bytes * 2.5)
+    assert store.prune() == 2
+    assert sorted(os.listdir(tmp_path)) == ['newest', 'oldest']
+
+    store.max_bytes = 0
+    assert store.prune(keep='newest') == 1
+    assert os.listdir(tmp_path) == ['newest']
+
+    store.max_bytes = store_module.DEFAULT_SCENARIO_MAX_BYTES
+    store.max_age_seconds = 10
+    assert store.prune() == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_prune_removes_only_stale_staging_directories(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    stale, fresh = tmp_path / 'abc.1.tmp', tmp_path / 'abc.2.tmp'
+    stale.mkdir()
+    fresh.mkdir()
+    old = time.time() - store_module.STALE_STAGING_SECONDS - 10
+    os.utime(stale, (old, old))
+    store.prune()
+    assert os.listdir(tmp_path) == ['abc.2.tmp']
+
+
+def test_get_or_create_generates_once(tmp_path):
+    store = ScenarioStore(str(tmp_path))
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return make_scenario()
+
+    first = store.get_or_create('abc', generate)
+    second = store.get_or_create('abc', generate)
+    assert first == second and len(calls) == 1
@@ -0,0 +1,45 @@
+"""Checks sweep expansion and the Parquet output of a small sweep."""
+import pyarrow.parquet as pq
+import pytest
+
+from risk_engine.sweep import RESULT_SCHEMA, iter_runs, run_sweep
+
+
+def test_grid_values_take_the_type_of_their_default():
+    runs = list(iter_runs({'grid': {'growth_rate': [0, 0.5], 'window_days': [7, 30.0], 'loss_freq_mean': [1, 2.5]}}))
+    assert len(runs) == 8
+    assert {type(params['growth_rate']) for _, params, _ in runs} == {float}
+    assert {type(params['window_days']) for _, params, _ in runs} == {int}
+    assert [run_id for run_id, _, _ in runs] == list(range(8))
+    with pytest.raises(ValueError, match="integer"):
+        list(iter_runs({'grid': {'window_days': [7.5]}}))
+    with pytest.raises(ValueError, match="Unknown"):
+        list(iter_runs({'grid': {'not_a_parameter': [1]}}))
+
+
+def test_run_seeds_depend_only_on_the_master_seed_and_position():
+    spec = {'mode': 'random', 'seed': 11, 'ranges': {'loss_sev_mean': [800, 2000], 'window_days': [5, 60]}, 'n_runs': 5}
+    first, second = list(iter_runs(spec)), list(iter_runs(spec))
+    assert first == second
+    assert len({seed for _, _, seed in first}) == 5
+    assert all(isinstance(params['window_days'], int) and 5 <= params['window_days'] <= 60 for _, params, _ in first)
+
+
+def test_sweep_writes_mixed_grids_and_failed_runs(tmp_path):
+    output = str(tmp_path / 'results.parquet')
+    spec = {
+        'seed': 3,
+        'base': {'mc_scenarios': 1000, 'loss_freq_model': 'Negative Binomial'},
+        # A std of 1 gives std^2 <= mean, which the Negative Binomial rejects
+        'grid': {'loss_freq_mean': [1, 2.5], 'loss_freq_std': [1, 3]},
+    }
+    assert run_sweep(spec, output, n_workers=2, batch_size=1) == 4
+
+    table = pq.read_table(output)
+    assert table.schema.equals(RESULT_SCHEMA)
+    rows = sorted(table.to_pylist(), key=lambda row: row['run_id'])
+    failed = [row for row in rows if row['error'] is not None]
+    assert [(row['loss_freq_mean'], row['loss_freq_std']) for row in failed] == [(1.0, 1.0), (2.5, 1.0)]
+    assert all(row['n_days'] is None and 'Negative Binomial' in row['error'] for row in failed)
+    succeeded = [row for row in rows if row['error'] is None]
+    assert len(succeeded) == 2 and all(row['n_days'] == 31 and row['mc_var'] > 0 for row in succeeded)